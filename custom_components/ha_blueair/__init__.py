@@ -1,11 +1,14 @@
+import asyncio
 import logging
-from datetime import timedelta
+from collections.abc import Awaitable
+from datetime import datetime, timedelta
+from typing import Any
 
 import voluptuous as vol
 
 from aiohttp import ClientError
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.const import (
     CONF_USERNAME,
@@ -16,20 +19,53 @@ from homeassistant.const import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.typing import ConfigType
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from blueair_api import get_devices, get_aws_devices, LoginError, MqttAwsBlueair
+from homeassistant.helpers.event import async_track_time_interval
+from blueair_api import (
+    LoginError,
+    SessionError,
+    HttpAwsBlueair,
+    HttpBlueair,
+    Device,
+    DeviceAws,
+)
 
-from .mqtt_mapping import map_and_publish_event
+from .mqtt_credentials import MqttCredentials
+from .mqtt_shard import MqttShard, split_devices
+from .mqtt_update_buffer import MqttUpdateBuffer
+from .poll_scheduler import stagger_refreshes
+from .token_manager import TokenManager
+from .token_store import TokenStore
+from .device_snapshot import DeviceSnapshot
+from .blueair_update_coordinator import BlueairUpdateCoordinator
 from .blueair_update_coordinator_device import BlueairUpdateCoordinatorDevice
 from .blueair_update_coordinator_device_aws import BlueairUpdateCoordinatorDeviceAws
+from .blueair_update_coordinator_account import BlueairUpdateCoordinatorAccount
 from .const import (
     DOMAIN,
     PLATFORMS,
     DATA_DEVICES,
     DATA_AWS_DEVICES,
-    DATA_MQTT_CLIENT,
+    DATA_MQTT_SHARDS,
+    DATA_MQTT_CREDENTIALS,
+    DATA_TOKEN_MANAGER,
+    DATA_ACCOUNT,
+    DATA_FLOW_LOGINS,
     REGION_USA,
     DEFAULT_SCAN_INTERVAL,
+    CONF_POLL_JITTER,
+    DEFAULT_POLL_JITTER,
+    CONF_MAX_STALE_MINUTES,
+    DEFAULT_MAX_STALE_MINUTES,
+    CONF_MQTT_SHARDS,
+    DEFAULT_MQTT_SHARDS,
+    REFRESH_CONCURRENCY,
+    LEGACY_RECHECK_HOURS,
+    RECONCILE_RETRY_SECONDS,
+    RECONCILE_RETRY_MAX_SECONDS,
+    MQTT_FLUSH_WINDOW_SECONDS,
+    PUSH_STATUS_POLLING,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -63,7 +99,6 @@ async def async_migrate_entry(hass, config_entry: ConfigEntry):
 
 
 async def async_setup(hass: HomeAssistant, config_entry: ConfigType) -> bool:
-    hass.data.setdefault(DOMAIN, {})
     _LOGGER.debug("async setup")
     return True
 
@@ -74,170 +109,200 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry):
     password = config_entry.data[CONF_PASSWORD]
     region = config_entry.data[CONF_REGION]
     interval = config_entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    jitter = config_entry.options.get(CONF_POLL_JITTER, DEFAULT_POLL_JITTER)
+    max_stale_age = timedelta(
+        minutes=config_entry.options.get(CONF_MAX_STALE_MINUTES, DEFAULT_MAX_STALE_MINUTES)
+    )
+    mqtt_shards = config_entry.options.get(CONF_MQTT_SHARDS, DEFAULT_MQTT_SHARDS)
     _LOGGER.debug(f"setting up scan interval: {interval}")
 
     data = {}
 
     client_session = async_get_clientsession(hass)
-    try:
-        try:
-            _, devices = await get_devices(
-                username=username, password=password, client_session=client_session
-            )
-        except LoginError as ex:
-            _LOGGER.debug(f"Legacy Login error: {ex}")
-            devices = []
-        except (ClientError, TimeoutError) as ex:
-            _LOGGER.warning(f"Legacy Blueair API unavailable, skipping legacy devices: {ex}")
-            devices = []
-        aws_http_client, aws_devices = await get_aws_devices(
+    snapshot = DeviceSnapshot(hass, config_entry.entry_id)
+    token_store = TokenStore(hass, config_entry.entry_id)
+    http_client = HttpBlueair(
+        username=username, password=password, client_session=client_session
+    )
+    aws_http_client, aws_api_devices = hass.data.get(DOMAIN, {}).get(
+        DATA_FLOW_LOGINS, {}
+    ).pop(username, (None, None))
+    if aws_http_client is None:
+        aws_http_client = HttpAwsBlueair(
             username=username,
             password=password,
-            client_session=client_session,
             region=region,
+            client_session=client_session,
         )
+    # Polls, commands and MQTT share one login of the AWS account, which
+    # is stored so the next start can skip it.
+    data[DATA_TOKEN_MANAGER] = TokenManager(
+        hass, aws_http_client, token_store.async_schedule_save
+    )
+    # The clients log in on first use unless the stored login is still good.
+    restored, _ = await asyncio.gather(
+        snapshot.async_load(http_client, aws_http_client),
+        token_store.async_load(http_client, aws_http_client),
+    )
+    try:
+        if restored is not None:
+            _LOGGER.debug("creating devices from the stored snapshot")
+            devices, aws_devices, last_updated = restored
+        else:
+            # Fetch from the legacy and AWS clouds at the same time.
+            last_updated = {}
+            legacy_api_devices, aws_devices = await _async_gather_or_cancel(
+                _async_get_legacy_api_devices(http_client, token_store),
+                _async_get_aws_devices(aws_http_client, aws_api_devices),
+            )
+            devices = []
+            if legacy_api_devices is not None:
+                devices = await _async_create_legacy_devices(
+                    http_client,
+                    _async_drop_legacy_duplicates(
+                        hass,
+                        config_entry,
+                        token_store,
+                        legacy_api_devices,
+                        [(device.uuid, device.mac) for device in aws_devices],
+                    ),
+                )
 
         def create_coordinators(device):
             return BlueairUpdateCoordinatorDevice(
                 hass=hass,
                 blueair_api_device=device,
                 interval=interval,
+                max_stale_age=max_stale_age,
             )
         data[DATA_DEVICES] = list(map(create_coordinators, devices))
         def create_aws_coordinators(device):
+            # AWS devices are polled by the account coordinator below, so
+            # they get no timer of their own.
             return BlueairUpdateCoordinatorDeviceAws(
                 hass=hass,
                 blueair_api_device=device,
-                interval=interval,
+                interval=None,
+                max_stale_age=max_stale_age,
             )
         data[DATA_AWS_DEVICES] = list(map(create_aws_coordinators, aws_devices))
 
-        coordinators = data[DATA_DEVICES] + data[DATA_AWS_DEVICES]
-
-        for coordinator in coordinators:
-            await coordinator.async_config_entry_first_refresh()
+        account_coordinator = None
+        if data[DATA_AWS_DEVICES]:
+            account_coordinator = BlueairUpdateCoordinatorAccount(
+                hass=hass,
+                config_entry=config_entry,
+                coordinators=data[DATA_AWS_DEVICES],
+                interval=interval,
+            )
+        data[DATA_ACCOUNT] = account_coordinator
+
+        # Only legacy devices and the account poll on a timer of their own.
+        polled_coordinators = list(data[DATA_DEVICES])
+        if account_coordinator is not None:
+            polled_coordinators.append(account_coordinator)
+        stagger_refreshes(polled_coordinators, timedelta(minutes=interval), jitter)
+
+        # Restored devices are seeded with their stored state and all refresh
+        # in the background once the platforms are set up.
+        await _async_first_refresh(
+            data[DATA_DEVICES] + data[DATA_AWS_DEVICES], last_updated
+        )
 
-        # Start MQTT for real-time updates on AWS devices.
-        mqtt_client = None
-        if (
-            aws_devices
-            and aws_http_client.mqtt_auth_name
-            and aws_http_client.mqtt_auth_signature
-            and aws_http_client.mqtt_auth_token
-        ):
-            try:
-                mqtt_client = MqttAwsBlueair(
-                    region=region,
-                    mqtt_auth_name=aws_http_client.mqtt_auth_name,
-                    mqtt_auth_signature=aws_http_client.mqtt_auth_signature,
-                    mqtt_auth_token=aws_http_client.mqtt_auth_token,
-                    user_id=aws_http_client.user_id,
-                )
+        if account_coordinator is not None:
+            # Nothing subscribes to the account coordinator itself; a no-op
+            # listener keeps its refresh timer running.
+            config_entry.async_on_unload(account_coordinator.async_add_listener(lambda: None))
 
-                # Build a lookup from device UUID to coordinator
-                aws_coordinator_map = {
-                    c.id: c for c in data[DATA_AWS_DEVICES]
-                }
-
-                def on_sensor_data(device_id, sensors):
-                    """Handle MQTT sensor data (called from MQTT thread)."""
-                    _LOGGER.debug(f"processing sensor update {sensors} for {device_id}")
-                    coordinator = aws_coordinator_map.get(device_id)
-                    if coordinator is None:
-                        _LOGGER.debug(f"sensor data update provided for unknown device: {device_id}")
-                        return
-                    device = coordinator.blueair_api_device
-                    try:
-                        device.apply_sensor_data(sensors)
-                    except Exception:
-                        _LOGGER.exception(
-                            "apply_sensor_data raised for device %s with payload %r",
-                            device_id, sensors,
-                        )
-                        return
-                    device.publish_updates()
-                    # Schedule HA state update on the event loop (thread-safe)
-                    hass.loop.call_soon_threadsafe(
-                        coordinator.async_set_updated_data, str(device)
-                    )
-
-                def on_state_change(device_id, state):
-                    """Handle MQTT shadow state change (called from MQTT thread)."""
-                    _LOGGER.debug(f"processing state change {state} for {device_id}")
-                    coordinator = aws_coordinator_map.get(device_id)
-                    if coordinator is None:
-                        _LOGGER.debug(f"state change provided for unknown device: {device_id}")
-                        return
-                    device = coordinator.blueair_api_device
-                    try:
-                        device.apply_state_change(state)
-                    except Exception:
-                        _LOGGER.exception(
-                            "apply_state_change raised for device %s with payload %r",
-                            device_id, state,
-                        )
-                        return
-                    device.publish_updates()
-                    hass.loop.call_soon_threadsafe(
-                        coordinator.async_set_updated_data, str(device)
-                    )
-
-                def on_event(device_id, event):
-                    """Handle MQTT connectivity event (called from MQTT thread)."""
-                    _LOGGER.debug(f"processing event update {event} for {device_id}")
-                    coordinator = aws_coordinator_map.get(device_id)
-                    if coordinator is None:
-                        _LOGGER.debug(f"event data update provided for unknown device: {device_id}")
-                        return
-                    device = coordinator.blueair_api_device
-                    map_and_publish_event(event, device)
-                    hass.loop.call_soon_threadsafe(
-                        coordinator.async_set_updated_data, str(device)
-                    )
-
-
-                mqtt_client.on_sensor_data = on_sensor_data
-                mqtt_client.on_state_change = on_state_change
-                mqtt_client.on_event = on_event
-
-                # Credential refresher for automatic reconnect on token expiry.
-                async def refresh_mqtt_credentials():
-                    await aws_http_client.refresh_access_token()
-                    return (
-                        aws_http_client.mqtt_auth_name,
-                        aws_http_client.mqtt_auth_signature,
-                        aws_http_client.mqtt_auth_token,
-                    )
-
-                mqtt_client.credential_refresher = refresh_mqtt_credentials
-
-                for device in aws_devices:
-                    mqtt_client.register_device(device.uuid)
-
-                # Run connect in executor to avoid blocking the event loop
-                # (TLS handshake is a blocking operation)
-                await hass.async_add_executor_job(mqtt_client.connect, hass.loop)
-                _LOGGER.info("MQTT real-time updates started for %d device(s)", len(aws_devices))
-            except Exception:
-                _LOGGER.exception("Failed to start MQTT, falling back to polling only")
-                if mqtt_client is not None:
-                    mqtt_client.disconnect()
-                mqtt_client = None
-        else:
-            _LOGGER.debug("MQTT credentials not available, using polling only")
+        data[DATA_MQTT_SHARDS] = []
+        data[DATA_MQTT_CREDENTIALS] = None
 
-        data[DATA_MQTT_CLIENT] = mqtt_client
-        hass.data[DOMAIN] = data
+        snapshot.async_track(data[DATA_DEVICES] + data[DATA_AWS_DEVICES])
+        for coordinator in data[DATA_DEVICES] + data[DATA_AWS_DEVICES]:
+            config_entry.async_on_unload(
+                coordinator.async_add_listener(snapshot.async_schedule_save)
+            )
+        snapshot.async_schedule_save()
+        token_store.async_schedule_save()
+        config_entry.runtime_data = data
 
         await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
         _LOGGER.debug("integration setup completed")
 
+        # MQTT connects off the startup path; polling covers devices until
+        # their push stream is up.
+        if restored is not None:
+            config_entry.async_create_background_task(
+                hass,
+                _async_reconcile(
+                    hass,
+                    config_entry,
+                    data,
+                    snapshot,
+                    http_client,
+                    aws_http_client,
+                    token_store,
+                    region,
+                    mqtt_shards,
+                ),
+                f"{DOMAIN} reconcile {config_entry.title}",
+            )
+        else:
+            config_entry.async_create_background_task(
+                hass,
+                _async_start_mqtt(
+                    hass, data, region, aws_http_client, data[DATA_AWS_DEVICES], mqtt_shards
+                ),
+                f"{DOMAIN} mqtt {config_entry.title}",
+            )
+
+        @callback
+        def async_recheck_legacy_devices(_now: datetime | None = None) -> None:
+            config_entry.async_create_background_task(
+                hass,
+                _async_recheck_legacy_devices(
+                    hass, config_entry, snapshot, http_client, token_store
+                ),
+                f"{DOMAIN} legacy recheck {config_entry.title}",
+            )
+
+        @callback
+        def async_track_legacy_recheck() -> None:
+            """Re-check the legacy cloud periodically from when it is skipped."""
+            token_store.on_no_legacy_devices = None
+            config_entry.async_on_unload(
+                async_track_time_interval(
+                    hass,
+                    async_recheck_legacy_devices,
+                    timedelta(hours=LEGACY_RECHECK_HOURS),
+                )
+            )
+
+        if token_store.no_legacy_devices_since is not None:
+            if token_store.legacy_recheck_due:
+                async_recheck_legacy_devices()
+            async_track_legacy_recheck()
+        else:
+            # The reconcile or a refused login may still mark the account.
+            token_store.on_no_legacy_devices = async_track_legacy_recheck
+
         async def update_listener(hass: HomeAssistant, updated_config_entry: ConfigEntry):
             """Handle options update."""
             new_interval = updated_config_entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+            new_jitter = updated_config_entry.options.get(CONF_POLL_JITTER, DEFAULT_POLL_JITTER)
+            new_max_stale_age = timedelta(
+                minutes=updated_config_entry.options.get(
+                    CONF_MAX_STALE_MINUTES, DEFAULT_MAX_STALE_MINUTES
+                )
+            )
+            if updated_config_entry.options.get(CONF_MQTT_SHARDS, DEFAULT_MQTT_SHARDS) != mqtt_shards:
+                # The devices have to be subscribed again on new connections.
+                hass.config_entries.async_schedule_reload(updated_config_entry.entry_id)
+                return
             _LOGGER.debug(f"changing scan interval: {new_interval}")
-            for coordinator_to_update in coordinators:
-                coordinator_to_update.update_interval = timedelta(minutes=new_interval)
+            stagger_refreshes(polled_coordinators, timedelta(minutes=new_interval), new_jitter)
+            for coordinator in data[DATA_DEVICES] + data[DATA_AWS_DEVICES]:
+                coordinator.max_stale_age = new_max_stale_age
         config_entry.async_on_unload(config_entry.add_update_listener(update_listener))
 
         return True
@@ -249,18 +314,364 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry):
         raise ConfigEntryNotReady("Blueair cloud unreachable") from error
 
 
+async def _async_first_refresh(
+    coordinators: list[BlueairUpdateCoordinator], last_updated: dict[str, datetime]
+) -> None:
+    """Seed or fetch the first data of each device coordinator.
+
+    Devices that already hold state are seeded from it; only the rest are
+    fetched, sharing a semaphore so large accounts don't open every
+    request at once.  The account coordinator needs no first refresh of
+    its own and first runs on its scheduled phase.
+    """
+    semaphore = asyncio.Semaphore(REFRESH_CONCURRENCY)
+
+    async def first_refresh(coordinator):
+        async with semaphore:
+            await coordinator.async_config_entry_first_refresh()
+
+    first_refreshes = []
+    for coordinator in coordinators:
+        if coordinator.has_device_state:
+            coordinator.async_seed(last_updated.get(coordinator.id))
+        else:
+            first_refreshes.append(first_refresh(coordinator))
+    _LOGGER.debug(
+        "seeded %d device(s), fetching %d",
+        len(coordinators) - len(first_refreshes),
+        len(first_refreshes),
+    )
+    await asyncio.gather(*first_refreshes)
+
+
+async def _async_gather_or_cancel(*aws: Awaitable[Any]) -> list[Any]:
+    """Await all at the same time; if one fails, cancel the others."""
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+async def _async_reconcile(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    data: dict,
+    snapshot: DeviceSnapshot,
+    http_client: HttpBlueair,
+    aws_http_client: HttpAwsBlueair,
+    token_store: TokenStore,
+    region: str,
+    mqtt_shards: int,
+) -> None:
+    """Bring devices restored from the snapshot up to date with the cloud.
+
+    If the cloud lists different devices than the snapshot, the snapshot
+    is dropped and the entry reloaded, so it sets up from the cloud;
+    otherwise every device is refreshed.  While the cloud is unreachable
+    the restored devices are kept and the reconcile is retried with
+    backoff.  MQTT starts right away with a restored login, or else once
+    the reconcile has logged in.
+    """
+    mqtt_started = bool(aws_http_client.mqtt_auth_token)
+    if mqtt_started:
+        config_entry.async_create_background_task(
+            hass,
+            _async_start_mqtt(
+                hass, data, region, aws_http_client, data[DATA_AWS_DEVICES], mqtt_shards
+            ),
+            f"{DOMAIN} mqtt {config_entry.title}",
+        )
+
+    retry_delay = RECONCILE_RETRY_SECONDS
+    while True:
+        try:
+            legacy_api_devices, aws_api_devices = await _async_gather_or_cancel(
+                _async_get_legacy_api_devices(http_client, token_store),
+                aws_http_client.devices(),
+            )
+            break
+        except (LoginError, SessionError, ClientError, TimeoutError, ValueError) as error:
+            _LOGGER.warning(
+                f"Blueair cloud unreachable, keeping stored devices and retrying in "
+                f"{retry_delay} s: {error}"
+            )
+            if not mqtt_started:
+                for coordinator in data[DATA_AWS_DEVICES]:
+                    coordinator.async_set_push_status(PUSH_STATUS_POLLING)
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, RECONCILE_RETRY_MAX_SECONDS)
+
+    aws_uuids = {api_device["uuid"] for api_device in aws_api_devices}
+    # The legacy cloud being down is no reason to drop its devices.
+    if legacy_api_devices is None:
+        legacy_uuids = {c.id for c in data[DATA_DEVICES]}
+    else:
+        legacy_uuids = {
+            api_device["uuid"]
+            for api_device in _async_drop_legacy_duplicates(
+                hass,
+                config_entry,
+                token_store,
+                legacy_api_devices,
+                [(api_device["uuid"], api_device.get("mac")) for api_device in aws_api_devices],
+            )
+        }
+    if legacy_uuids != {c.id for c in data[DATA_DEVICES]} or aws_uuids != {
+        c.id for c in data[DATA_AWS_DEVICES]
+    }:
+        _LOGGER.info("Blueair device list changed, reloading")
+        await snapshot.async_remove()
+        hass.config_entries.async_schedule_reload(config_entry.entry_id)
+        return
+
+    semaphore = asyncio.Semaphore(REFRESH_CONCURRENCY)
+
+    async def refresh(coordinator):
+        async with semaphore:
+            await coordinator.async_refresh()
+
+    refreshes = [refresh(c) for c in data[DATA_DEVICES]]
+    if data[DATA_ACCOUNT] is not None:
+        refreshes.append(data[DATA_ACCOUNT].async_refresh())
+    await asyncio.gather(*refreshes)
+
+    if not mqtt_started:
+        await _async_start_mqtt(
+            hass, data, region, aws_http_client, data[DATA_AWS_DEVICES], mqtt_shards
+        )
+
+
+async def _async_list_legacy_devices(
+    http_client: HttpBlueair, token_store: TokenStore
+) -> list[dict] | None:
+    """List the legacy devices, or return None if the legacy cloud is unreachable."""
+    try:
+        return await http_client.get_devices()
+    except LoginError as ex:
+        _LOGGER.debug(f"Legacy Login error: {ex}")
+        token_store.async_record_legacy_login_failure()
+        return None
+    except (ClientError, TimeoutError) as ex:
+        _LOGGER.warning(f"Legacy Blueair API unavailable: {ex}")
+        return None
+
+
+async def _async_get_legacy_api_devices(
+    http_client: HttpBlueair, token_store: TokenStore
+) -> list[dict] | None:
+    """Return the listed legacy devices, or None if they can't be listed."""
+    # Rechecked in the background instead.
+    if token_store.no_legacy_devices_since is not None:
+        return None
+    return await _async_list_legacy_devices(http_client, token_store)
+
+
+async def _async_create_legacy_devices(
+    http_client: HttpBlueair, api_devices: list[dict]
+) -> list[Device]:
+    """Return the listed legacy devices, or none if the legacy cloud is unusable."""
+    try:
+        return [
+            await Device.create_device(
+                api=http_client,
+                uuid=api_device["uuid"],
+                name=api_device["name"],
+                mac=api_device["mac"],
+            )
+            for api_device in api_devices
+        ]
+    except (LoginError, SessionError) as ex:
+        _LOGGER.warning(f"Legacy Blueair login failed, skipping legacy devices: {ex}")
+        return []
+    except (ClientError, TimeoutError) as ex:
+        _LOGGER.warning(f"Legacy Blueair API unavailable, skipping legacy devices: {ex}")
+        return []
+
+
+def _mac_key(mac: str) -> str:
+    return mac.replace(":", "").replace("-", "").lower()
+
+
+def _legacy_duplicates(
+    legacy: list[tuple[str, str | None]], aws: list[tuple[str, str | None]]
+) -> set[str]:
+    """Return the uuids of the legacy devices that are AWS devices as well.
+
+    Devices are given as (uuid, mac) and match by either.  The legacy
+    list reports the mac of such devices as null, so mostly by uuid.
+    """
+    aws_uuids = {uuid.lower() for uuid, _ in aws}
+    aws_macs = {_mac_key(mac) for _, mac in aws if mac}
+    return {
+        uuid
+        for uuid, mac in legacy
+        if uuid.lower() in aws_uuids or (mac and _mac_key(mac) in aws_macs)
+    }
+
+
+@callback
+def _async_drop_legacy_duplicates(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    token_store: TokenStore,
+    legacy_api_devices: list[dict],
+    aws: list[tuple[str, str | None]],
+) -> list[dict]:
+    """Return the legacy devices that aren't AWS devices as well.
+
+    Purifiers listed by both clouds are only set up as AWS devices.  A
+    duplicate with a uuid of its own left its identifier and entities in
+    the registry.  The registry merges devices sharing a MAC, so that
+    identifier may sit on the AWS device; only the legacy parts are
+    removed from it then.  Whether the account has legacy devices left is
+    recorded.
+    """
+    duplicates = _legacy_duplicates(
+        [(api_device["uuid"], api_device.get("mac")) for api_device in legacy_api_devices],
+        aws,
+    )
+    token_store.async_set_legacy_devices_found(len(duplicates) < len(legacy_api_devices))
+    if not duplicates:
+        return legacy_api_devices
+    _LOGGER.debug(f"skipping legacy devices also listed as AWS devices: {duplicates}")
+    aws_identifiers = {(DOMAIN, uuid) for uuid, _ in aws}
+    device_registry = dr.async_get(hass)
+    entity_registry = er.async_get(hass)
+    for uuid in duplicates - {uuid for uuid, _ in aws}:
+        device = device_registry.async_get_device(identifiers={(DOMAIN, uuid)})
+        if device is None:
+            continue
+        if not device.identifiers & aws_identifiers:
+            device_registry.async_update_device(
+                device.id, remove_config_entry_id=config_entry.entry_id
+            )
+            continue
+        # Shared with the AWS device, whose entities have to stay.
+        for entity in er.async_entries_for_device(
+            entity_registry, device.id, include_disabled_entities=True
+        ):
+            if entity.platform == DOMAIN and entity.unique_id.startswith(f"{uuid}_"):
+                entity_registry.async_remove(entity.entity_id)
+        device_registry.async_update_device(
+            device.id, new_identifiers=device.identifiers - {(DOMAIN, uuid)}
+        )
+    return [
+        api_device for api_device in legacy_api_devices if api_device["uuid"] not in duplicates
+    ]
+
+
+async def _async_recheck_legacy_devices(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    snapshot: DeviceSnapshot,
+    http_client: HttpBlueair,
+    token_store: TokenStore,
+) -> None:
+    """List the legacy devices of an account that had none; reload if it has now."""
+    legacy_api_devices = await _async_list_legacy_devices(http_client, token_store)
+    if legacy_api_devices is None:
+        return
+    aws = [
+        (coordinator.id, coordinator.blueair_api_device.mac)
+        for coordinator in config_entry.runtime_data[DATA_AWS_DEVICES]
+    ]
+    if _async_drop_legacy_duplicates(hass, config_entry, token_store, legacy_api_devices, aws):
+        _LOGGER.info("Legacy Blueair devices found, reloading")
+        await snapshot.async_remove()
+        hass.config_entries.async_schedule_reload(config_entry.entry_id)
+
+
+async def _async_get_aws_devices(
+    aws_http_client: HttpAwsBlueair, api_devices: list[dict] | None = None
+) -> list[DeviceAws]:
+    """Return the AWS devices of the account, from ``api_devices`` if listed already."""
+    if api_devices is None:
+        api_devices = await aws_http_client.devices()
+    return [
+        await DeviceAws.create_device(
+            api=aws_http_client,
+            uuid=api_device["uuid"],
+            name=api_device["name"],
+            mac=api_device["mac"],
+            type_name=api_device["type"],
+        )
+        for api_device in api_devices
+    ]
+
+
+async def _async_start_mqtt(
+    hass: HomeAssistant,
+    data: dict,
+    region: str,
+    aws_http_client: HttpAwsBlueair,
+    aws_coordinators: list[BlueairUpdateCoordinatorDeviceAws],
+    shard_count: int,
+) -> None:
+    """Start MQTT for real-time updates on AWS devices.
+
+    The devices are spread over up to ``shard_count`` connections, which
+    are stored in ``data`` before they connect so unload can stop them.
+    Devices of a shard that fails to start keep being polled.
+    """
+    if not (
+        aws_coordinators
+        and aws_http_client.mqtt_auth_name
+        and aws_http_client.mqtt_auth_signature
+        and aws_http_client.mqtt_auth_token
+    ):
+        _LOGGER.debug("MQTT credentials not available, using polling only")
+        for coordinator in aws_coordinators:
+            coordinator.async_set_push_status(PUSH_STATUS_POLLING)
+        return
+
+    # Updates reach the event loop in batches (thread-safe)
+    update_buffer = MqttUpdateBuffer(hass, MQTT_FLUSH_WINDOW_SECONDS)
+    credentials = MqttCredentials(hass, aws_http_client)
+    groups = split_devices(aws_coordinators, shard_count)
+    shards = [
+        MqttShard(
+            hass,
+            index,
+            len(groups),
+            coordinators,
+            region,
+            aws_http_client,
+            update_buffer,
+            credentials.async_get,
+        )
+        for index, coordinators in enumerate(groups)
+    ]
+    credentials.shards = shards
+    data[DATA_MQTT_SHARDS] = shards
+    data[DATA_MQTT_CREDENTIALS] = credentials
+    await asyncio.gather(*(shard.async_start() for shard in shards))
+    credentials.async_schedule()
+
+
 async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry):
     _LOGGER.debug("unload entry")
     # Disconnect MQTT before unloading platforms
-    data = hass.data.get(DOMAIN)
-    if data and data.get(DATA_MQTT_CLIENT):
-        data[DATA_MQTT_CLIENT].disconnect()
-        _LOGGER.info("MQTT disconnected")
+    if config_entry.runtime_data[DATA_MQTT_CREDENTIALS] is not None:
+        config_entry.runtime_data[DATA_MQTT_CREDENTIALS].async_cancel()
+    shards = [
+        shard for shard in config_entry.runtime_data[DATA_MQTT_SHARDS] if shard.client is not None
+    ]
+    # Each disconnect blocks until the shard's network thread has stopped.
+    await asyncio.gather(
+        *(hass.async_add_executor_job(shard.client.disconnect) for shard in shards)
+    )
+    for shard in shards:
+        _LOGGER.info("MQTT shard %s disconnected", shard.name)
 
-    unload_ok = await hass.config_entries.async_unload_platforms(
+    return await hass.config_entries.async_unload_platforms(
         config_entry, PLATFORMS
     )
-    if unload_ok:
-        hass.data[DOMAIN] = None
 
-    return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Delete the device snapshot and stored login of a removed entry."""
+    await DeviceSnapshot(hass, config_entry.entry_id).async_remove()
+    await TokenStore(hass, config_entry.entry_id).async_remove()
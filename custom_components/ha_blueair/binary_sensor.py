@@ -1,3 +1,5 @@
+from typing import Any
+
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntity,
@@ -5,8 +7,12 @@ from homeassistant.components.binary_sensor import (
 )
 
 from .blueair_update_coordinator import BlueairUpdateCoordinator
+from .blueair_update_coordinator_device_aws import BlueairUpdateCoordinatorDeviceAws
 from .entity import BlueairEntity, async_setup_entry_helper
 
+# Whether the device's updates are pushed over MQTT (AWS devices only).
+ATTR_PUSH_STATUS = "push_status"
+
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up the Blueair sensors from config entry."""
@@ -20,14 +26,16 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
 class BlueairBinarySensor(BlueairEntity, BinarySensorEntity):
     @classmethod
     def is_implemented(kls, coordinator: BlueairUpdateCoordinator) -> bool:
-        # See sensor.BlueairSensor.is_implemented (issue #356) for rationale
-        # on the NotImplemented default.
-        return getattr(coordinator, kls(coordinator).entity_description.key, NotImplemented) is not NotImplemented
+        # See sensor.BlueairSensor.is_implemented (issue #356).
+        return coordinator.implements(kls.entity_description.key)
 
     def __init__(self, coordinator):
         """Initialize the temperature sensor."""
         super().__init__(self.entity_description.name, coordinator)
 
+    def coordinator_properties(self) -> tuple[str, ...]:
+        return (self.entity_description.key,)
+
     @property
     def is_on(self) -> bool | None:
         """Return true if the binary sensor is on."""
@@ -50,6 +58,8 @@ class BlueairOnlineSensor(BlueairBinarySensor):
         device_class=BinarySensorDeviceClass.CONNECTIVITY,
         icon="mdi:wifi-check",
     )
+    # Changes with every MQTT drop and reconnect.
+    _unrecorded_attributes = BlueairEntity._unrecorded_attributes | {ATTR_PUSH_STATUS}
 
     @property
     def icon(self) -> str | None:
@@ -63,6 +73,16 @@ class BlueairOnlineSensor(BlueairBinarySensor):
         """Return if entity is available."""
         return True
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return how the device's updates arrive."""
+        if not isinstance(self.coordinator, BlueairUpdateCoordinatorDeviceAws):
+            return super().extra_state_attributes
+        return {
+            **(super().extra_state_attributes or {}),
+            ATTR_PUSH_STATUS: self.coordinator.push_status,
+        }
+
 
 class BlueairWaterShortageSensor(BlueairBinarySensor):
     entity_description = BinarySensorEntityDescription(
@@ -1,29 +1,99 @@
 """Blueair device object."""
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import timedelta
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from functools import partial
+from time import monotonic
 from abc import ABC, abstractmethod
+from typing import Any
 
 from blueair_api import Device as BlueAirApiDevice, DeviceAws as BlueAirAwsDevice
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, REQUEST_REFRESH_DEFAULT_COOLDOWN, Debouncer
+from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN
+from .device_state import StateField, convert_state, device_state, state_fields
+from .poll_scheduler import PhasedRefreshMixin
 
 _LOGGER = logging.getLogger(__name__)
 
+type _Write = Callable[[], Awaitable[Any]]
 
-class BlueairUpdateCoordinator(ABC, DataUpdateCoordinator):
-    """Blueair device object."""
+# Pending writes of the command batches open in the current task.
+_open_batches: ContextVar[dict[BlueairUpdateCoordinator, dict[str, _Write]] | None] = ContextVar(
+    "blueair_open_batches", default=None
+)
+
+
+class _StateValue:
+    """A coordinator property served from the converted state."""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._name = name
+
+    def __get__(self, coordinator: BlueairUpdateCoordinator | None, owner: type) -> Any:
+        if coordinator is None:
+            return self
+        return coordinator.state_values.get(self._name, NotImplemented)
+
+
+class BlueairUpdateCoordinator(PhasedRefreshMixin, ABC, DataUpdateCoordinator):
+    """Blueair device object.
+
+    When refreshes start failing the last good state keeps being served
+    for up to ``max_stale_age`` (see ``data_available``), so short cloud
+    outages don't flip every entity to unavailable.
+
+    Writes to the device go through a queue with one write in flight at a
+    time.  A queued write is replaced by a newer write to the same
+    attribute, so a dragged slider sends only the values the device can
+    keep up with.  Once the queue is empty the state is brought up to date
+    by ``_async_writes_sent``.
+
+    Listeners may register with the device state fields they depend on as
+    their context (see ``state_fields_for``); an update then only notifies
+    the listeners whose fields changed.
+
+    Most properties are described in ``state_table`` and converted once per
+    update, so reading them is a dictionary lookup.
+    """
+
+    # How each state property is read from the device state.
+    state_table: dict[str, StateField] = {
+        "online": StateField(("wifi_working",)),
+        "child_lock": StateField(("child_lock",)),
+        "night_mode": StateField(("night_mode",)),
+    }
 
     def __init__(
-        self, hass: HomeAssistant, blueair_api_device: BlueAirApiDevice | BlueAirAwsDevice, interval: int
+        self,
+        hass: HomeAssistant,
+        blueair_api_device: BlueAirApiDevice | BlueAirAwsDevice,
+        interval: int | None,
+        max_stale_age: timedelta = timedelta(0),
     ) -> None:
         """Initialize the device."""
         self.hass: HomeAssistant = hass
         self.blueair_api_device = blueair_api_device
+        self.max_stale_age = max_stale_age
+        self.last_success_time: datetime | None = None
+        self._unsub_stale_expiry: CALLBACK_TYPE | None = None
+        self._queued_writes: dict[str, tuple[_Write, list[asyncio.Future[None]]]] = {}
+        self._write_task: asyncio.Task[None] | None = None
+        # What the listeners were last notified of.
+        self._notified_data: tuple[Any, ...] | None = None
+        self._notified_status: tuple[Any, ...] | None = None
+        self._implemented: dict[str, bool] = {}
+        self._state_values: dict[str, Any] = {}
+        self._state_values_of: tuple[Any, ...] | None = None
         request_refresh_debouncer = Debouncer(
             hass,
             _LOGGER,
@@ -31,20 +101,259 @@ class BlueairUpdateCoordinator(ABC, DataUpdateCoordinator):
             immediate=False,
         )
 
-        async def refresh() -> str:
+        async def refresh() -> tuple[Any, ...]:
             await self.blueair_api_device.refresh()
-            return str(self.blueair_api_device)
+            self.last_success_time = dt_util.utcnow()
+            return device_state(self.blueair_api_device)
 
         super().__init__(
             hass,
             _LOGGER,
             name=f"{DOMAIN}-{self.blueair_api_device.name}",
-            update_interval=timedelta(minutes=interval),
+            update_interval=timedelta(minutes=interval) if interval is not None else None,
             update_method=refresh,
             request_refresh_debouncer=request_refresh_debouncer,
             always_update=False
         )
 
+    @property
+    def has_device_state(self) -> bool:
+        """Return True if the api device already holds fetched state."""
+        # raw_info is only assigned by a refresh of the api device.
+        return hasattr(self.blueair_api_device, "raw_info")
+
+    @property
+    def state_values(self) -> dict[str, Any]:
+        """Return the state properties converted from the current data."""
+        if self._state_values_of is not self.data:
+            self._state_values = (
+                {} if self.data is None else convert_state(self.data, self.state_table, self.model)
+            )
+            self._state_values_of = self.data
+        return self._state_values
+
+    def implements(self, prop: str) -> bool:
+        """Return True if the device implements the given coordinator property.
+
+        Whether a property is implemented follows from the device model, so
+        each property is looked up once and the answer is kept for entity
+        setup on every platform.
+        """
+        try:
+            return self._implemented[prop]
+        except KeyError:
+            # Properties only some coordinators declare count as not
+            # implemented on the others (issue #356).
+            implemented = getattr(self, prop, NotImplemented) is not NotImplemented
+            self._implemented[prop] = implemented
+            return implemented
+
+    def state_fields_for(self, properties: Iterable[str]) -> frozenset[str] | None:
+        """Return the device state fields the given coordinator properties read.
+
+        Returns None if any of them isn't backed by known fields, in which
+        case the listener has to be notified of every update.
+        """
+        names = state_fields(type(self.blueair_api_device))
+        fields: set[str] = set()
+        for prop in properties:
+            if prop in self.state_table:
+                fields.update(self.state_table[prop].sources)
+            elif prop in names:
+                fields.add(prop)
+            else:
+                return None
+        return frozenset(fields)
+
+    @callback
+    def async_seed(self, last_updated: datetime | None = None) -> None:
+        """Use the state the api device already holds as the first data."""
+        self.data = device_state(self.blueair_api_device)
+        self.last_update_success = True
+        self.last_success_time = last_updated or dt_util.utcnow()
+
+    @callback
+    def async_publish_device_state(self) -> None:
+        """Publish the current state of the api device to the entities."""
+        self.async_set_updated_data(device_state(self.blueair_api_device))
+
+    @callback
+    def async_set_updated_data(self, data: Any) -> None:
+        self.last_success_time = dt_util.utcnow()
+        super().async_set_updated_data(data)
+
+    @property
+    def data_available(self) -> bool:
+        """Return True while there is current or recent enough state to serve."""
+        if self.last_update_success:
+            return True
+        return (
+            self.last_success_time is not None
+            and dt_util.utcnow() - self.last_success_time <= self.max_stale_age
+        )
+
+    @callback
+    def async_update_listeners(self) -> None:
+        # Refresh failures only notify listeners when they start, so the end
+        # of the stale window needs a notification of its own.
+        self._async_cancel_stale_expiry()
+        if not self.last_update_success and self.data_available:
+            remaining = self.last_success_time + self.max_stale_age - dt_util.utcnow()
+            self._unsub_stale_expiry = async_call_later(
+                self.hass, remaining, self._async_stale_expired
+            )
+        changed = self._async_changed_fields()
+        for update_callback, fields in list(self._listeners.values()):
+            if changed is None or fields is None or not fields.isdisjoint(changed):
+                update_callback()
+
+    def listener_status(self) -> tuple[Any, ...]:
+        """Return what every entity depends on besides the device state."""
+        return (self.last_update_success, self.data_available)
+
+    @callback
+    def _async_changed_fields(self) -> set[str] | None:
+        """Return the state fields changed since the last notification.
+
+        Returns None when every listener has to be notified: on the first
+        notification, and when the ``listener_status`` changed.
+        """
+        previous = self._notified_data
+        status = self.listener_status()
+        changed_status = status != self._notified_status
+        self._notified_data = self.data
+        self._notified_status = status
+        if changed_status or previous is None or type(previous) is not type(self.data):
+            return None
+        changed = {
+            name
+            for name, old, new in zip(self.data._fields, previous, self.data, strict=True)
+            if old != new
+        }
+        # Every entity is unavailable while the device is offline.
+        if "wifi_working" in changed:
+            return None
+        return changed
+
+    @callback
+    def _async_stale_expired(self, _now: datetime) -> None:
+        self._unsub_stale_expiry = None
+        _LOGGER.debug(f"{self.name}: last good state is too old to serve")
+        self.async_update_listeners()
+
+    @callback
+    def _async_cancel_stale_expiry(self) -> None:
+        if self._unsub_stale_expiry is not None:
+            self._unsub_stale_expiry()
+            self._unsub_stale_expiry = None
+
+    async def async_shutdown(self) -> None:
+        self._async_cancel_stale_expiry()
+        if self._write_task is not None:
+            self._write_task.cancel()
+        for _, waiters in self._queued_writes.values():
+            for waiter in waiters:
+                waiter.cancel()
+        self._queued_writes.clear()
+        await super().async_shutdown()
+
+    @asynccontextmanager
+    async def batch(self) -> AsyncIterator[None]:
+        """Collect the writes of one user action behind a single refresh.
+
+        Writes made inside the block are held back, keeping only the latest
+        value per attribute, and sent in order when the block exits.
+        Nothing is sent if the block raises.
+        """
+        open_batches = _open_batches.get() or {}
+        if self in open_batches:
+            yield
+            return
+        pending: dict[str, _Write] = {}
+        token = _open_batches.set({**open_batches, self: pending})
+        try:
+            yield
+        finally:
+            _open_batches.reset(token)
+        # The cloud takes one attribute per request, so the writes still go
+        # out one by one.
+        await asyncio.gather(
+            *(self._async_queue_write(attribute, write) for attribute, write in pending.items())
+        )
+
+    async def _async_write(self, attribute: str, write: _Write) -> None:
+        """Send a write to the device, or hold it for the open batch."""
+        pending = (_open_batches.get() or {}).get(self)
+        if pending is not None:
+            pending.pop(attribute, None)
+            pending[attribute] = write
+            return
+        await self._async_queue_write(attribute, write)
+
+    @callback
+    def _async_queue_write(self, attribute: str, write: _Write) -> asyncio.Future[None]:
+        """Queue a write, replacing a queued write to the same attribute.
+
+        The returned future resolves once the write, or the newer write
+        that replaced it, has been sent.
+        """
+        waiter: asyncio.Future[None] = self.hass.loop.create_future()
+        # Re-queue at the end so the writes keep the order they were last made.
+        _, waiters = self._queued_writes.pop(attribute, (None, []))
+        waiters.append(waiter)
+        self._queued_writes[attribute] = (write, waiters)
+        if self._write_task is None:
+            # Not started eagerly: a task that finished within this call
+            # would be stored after clearing itself, and block every
+            # later write.
+            self._write_task = self.hass.async_create_background_task(
+                self._async_send_queued_writes(), f"{self.name} writes", eager_start=False
+            )
+        return waiter
+
+    async def _async_send_queued_writes(self) -> None:
+        sent: dict[str, float] = {}
+        failed = False
+        waiters: list[asyncio.Future[None]] = []
+        try:
+            while self._queued_writes:
+                attribute = next(iter(self._queued_writes))
+                write, waiters = self._queued_writes.pop(attribute)
+                sent[attribute] = monotonic()
+                try:
+                    await write()
+                except Exception as error:
+                    # Handed to every caller waiting on this write.
+                    failed = True
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_exception(error)
+                else:
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_result(None)
+        finally:
+            self._write_task = None
+            # Cancelled mid-write, on shutdown: the callers of the write in
+            # flight and of those still queued mustn't wait forever.
+            for waiter in waiters:
+                waiter.cancel()
+            for _, queued in self._queued_writes.values():
+                for waiter in queued:
+                    waiter.cancel()
+            self._queued_writes.clear()
+        await self._async_writes_sent(sent, failed)
+
+    async def _async_writes_sent(self, sent: dict[str, float], failed: bool) -> None:
+        """Bring the state up to date once the queued writes were sent.
+
+        ``sent`` maps each written attribute to the monotonic time its
+        write started.
+        """
+        # The api device applied the written values locally; show them now.
+        self.async_publish_device_state()
+        await self.async_request_refresh()
+
     @property
     def id(self) -> str:
         """Return Blueair device id."""
@@ -76,209 +385,64 @@ class BlueairUpdateCoordinator(ABC, DataUpdateCoordinator):
     def serial_number(self) -> str:
         pass
 
-    @property
-    def fan_speed(self) -> int:
-        """Return the current fan speed."""
-        return int(self.blueair_api_device.fan_speed)
-
     @property
     @abstractmethod
     def speed_count(self) -> int:
         """Return the max fan speed."""
         pass
 
-    @property
-    @abstractmethod
-    def is_on(self) -> bool:
-        pass
-
-    @property
-    def online(self) -> bool:
-        return self.blueair_api_device.wifi_working
-
-    @property
-    @abstractmethod
-    def brightness(self) -> int:
-        pass
-
-    @property
-    def child_lock(self) -> bool:
-        return self.blueair_api_device.child_lock
-
-    @property
-    @abstractmethod
-    def germ_shield(self) -> bool:
-        pass
-
-    @property
-    def night_mode(self) -> bool:
-        return self.blueair_api_device.night_mode
-
-    @property
-    @abstractmethod
-    def temperature(self) -> int:
-        pass
-
-    @property
-    @abstractmethod
-    def humidity(self) -> int:
-        pass
-
-    @property
-    @abstractmethod
-    def voc(self) -> int:
-        pass
-
-    @property
-    @abstractmethod
-    def pm1(self) -> int:
-        pass
-
-    @property
-    @abstractmethod
-    def pm10(self) -> int:
-        pass
-
-    @property
-    @abstractmethod
-    def pm25(self) -> int:
-        pass
-
-    @property
-    @abstractmethod
-    def co2(self) -> int:
-        pass
-
-    @property
-    @abstractmethod
-    def fan_auto_mode(self) -> bool | None | NotImplemented:
-        pass
-
-    @property
-    @abstractmethod
-    def wick_dry_mode(self) -> bool | None | NotImplemented:
-        pass
-
-    @property
-    @abstractmethod
-    def water_shortage(self) -> bool | None | NotImplemented:
-        pass
-
-    @property
-    @abstractmethod
-    def filter_expired(self) -> bool | None | NotImplemented:
-        """Return the current filter status."""
-        pass
-
-    @property
-    @abstractmethod
-    def filter_life(self) -> int | None | NotImplemented:
-        pass
-
-    @property
-    @abstractmethod
-    def wick_life(self) -> int | None | NotImplemented:
-        pass
-
-    @property
-    @abstractmethod
-    def main_mode(self) -> int | None | NotImplemented:
-        pass
-
-    @property
-    @abstractmethod
-    def heat_temp(self) -> int | None | NotImplemented:
-        pass
-
-    @property
-    @abstractmethod
-    def heat_sub_mode(self) -> int | None | NotImplemented:
-        pass
-
-    @property
-    @abstractmethod
-    def heat_fan_speed(self) -> int | None | NotImplemented:
-        pass
-
-    @property
-    @abstractmethod
-    def cool_sub_mode(self) -> int | None | NotImplemented:
-        pass
-
-    @property
-    @abstractmethod
-    def cool_fan_speed(self) -> int | None | NotImplemented:
-        pass
-
-    @property
-    @abstractmethod
-    def ap_sub_mode(self) -> int | None | NotImplemented:
-        pass
-
-    @property
-    @abstractmethod
-    def fan_speed_0(self) -> int | None | NotImplemented:
-        pass
-
-    @property
-    @abstractmethod
-    def temperature_unit(self) -> int | None | NotImplemented:
-        pass
-
-    @property
-    @abstractmethod
-    def water_refresher_life(self) -> int | None | NotImplemented:
-        pass
-
-    @property
-    @abstractmethod
-    def water_level(self) -> int | None | NotImplemented:
-        pass
-
-    @property
-    @abstractmethod
-    def mood_brightness(self) -> int | None | NotImplemented:
-        pass
-
-    @property
-    @abstractmethod
-    def auto_regulated_humidity(self) -> bool | None | NotImplemented:
-        pass
-
-    # ----- AWS-only sensor attributes (issue #356) -----
-    # Declared abstract so any subclass MUST provide a value (legacy
-    # subclasses return NotImplemented).  Prevents the v1.49.0 regression
-    # where AWS-only properties weren't stubbed on the legacy coordinator,
-    # causing AttributeError in sensor is_implemented() checks.
-
-    @property
-    @abstractmethod
-    def timer_duration(self) -> int | None | NotImplemented:
-        pass
-
-    @property
-    @abstractmethod
-    def timer_state(self) -> int | None | NotImplemented:
-        pass
-
-    @property
-    @abstractmethod
-    def rssi(self) -> int | None | NotImplemented:
-        pass
-
-    @property
-    @abstractmethod
-    def night_light_brightness(self) -> int | None | NotImplemented:
-        pass
-
-    @property
-    @abstractmethod
-    def hour_format(self) -> bool | None | NotImplemented:
-        pass
+    # ----- State properties -----
+    # Served from the converted state (see ``state_table``).  A coordinator
+    # whose table has no entry for one of them returns NotImplemented, so
+    # entity is_implemented() checks never hit a missing attribute (the
+    # v1.49.0 regression of issue #356).
+
+    fan_speed = _StateValue()
+    is_on = _StateValue()
+    online = _StateValue()
+    brightness = _StateValue()
+    child_lock = _StateValue()
+    germ_shield = _StateValue()
+    night_mode = _StateValue()
+    temperature = _StateValue()
+    humidity = _StateValue()
+    voc = _StateValue()
+    pm1 = _StateValue()
+    pm10 = _StateValue()
+    pm25 = _StateValue()
+    co2 = _StateValue()
+    fan_auto_mode = _StateValue()
+    wick_dry_mode = _StateValue()
+    water_shortage = _StateValue()
+    filter_expired = _StateValue()
+    filter_life = _StateValue()
+    wick_life = _StateValue()
+    water_refresher_life = _StateValue()
+    water_level = _StateValue()
+    mood_brightness = _StateValue()
+    auto_regulated_humidity = _StateValue()
+    humidifier_mode = _StateValue()
+    combo_mode = _StateValue()
+    main_mode = _StateValue()
+    heat_temp = _StateValue()
+    heat_sub_mode = _StateValue()
+    heat_fan_speed = _StateValue()
+    cool_sub_mode = _StateValue()
+    cool_fan_speed = _StateValue()
+    ap_sub_mode = _StateValue()
+    fan_speed_0 = _StateValue()
+    temperature_unit = _StateValue()
+    overall_firmware = _StateValue()
+    timer_duration = _StateValue()
+    timer_state = _StateValue()
+    rssi = _StateValue()
+    night_light_brightness = _StateValue()
+    hour_format = _StateValue()
 
     async def set_fan_speed(self, new_speed) -> None:
-        await self.blueair_api_device.set_fan_speed(new_speed)
-        await self.async_request_refresh()
+        await self._async_write(
+            "fan_speed", partial(self.blueair_api_device.set_fan_speed, new_speed)
+        )
 
     @abstractmethod
     async def set_brightness(self, brightness) -> None:
@@ -293,8 +457,9 @@ class BlueairUpdateCoordinator(ABC, DataUpdateCoordinator):
         pass
 
     async def set_child_lock(self, locked: bool) -> None:
-        await self.blueair_api_device.set_child_lock(locked)
-        await self.async_request_refresh()
+        await self._async_write(
+            "child_lock", partial(self.blueair_api_device.set_child_lock, locked)
+        )
 
     @abstractmethod
     async def set_night_mode(self, mode) -> None:
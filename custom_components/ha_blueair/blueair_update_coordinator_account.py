@@ -0,0 +1,99 @@
+"""Blueair account object."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import timedelta
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .blueair_update_coordinator_device_aws import BlueairUpdateCoordinatorDeviceAws
+from .const import DOMAIN, REFRESH_CONCURRENCY
+from .poll_scheduler import PhasedRefreshMixin
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class BlueairUpdateCoordinatorAccount(PhasedRefreshMixin, DataUpdateCoordinator):
+    """Refreshes every AWS device of a config entry in one scheduled cycle.
+
+    The AWS device coordinators have no timer of their own.  Once per
+    interval this coordinator refreshes all of them with bounded
+    concurrency and fans each result out to the matching device
+    coordinator, so a large account costs one wakeup per interval instead
+    of one per device.  Device coordinators still refresh themselves when
+    a write requests it.
+
+    Devices that are kept current by MQTT push are skipped until the push
+    stream goes quiet or disconnects (see ``poll_needed``).  Devices whose
+    refresh failed are retried on their own with the scheduler's backoff.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        coordinators: list[BlueairUpdateCoordinatorDeviceAws],
+        interval: int,
+    ) -> None:
+        """Initialize the account."""
+        self.coordinators = coordinators
+        self._semaphore = asyncio.Semaphore(REFRESH_CONCURRENCY)
+        # Devices whose last refresh failed.
+        self._failed_ids: set[str] = set()
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=config_entry,
+            name=f"{DOMAIN}-{config_entry.title}",
+            update_interval=timedelta(minutes=interval),
+            update_method=self._refresh_devices,
+            always_update=False,
+        )
+
+    async def _refresh_device(self, coordinator: BlueairUpdateCoordinatorDeviceAws) -> None:
+        async with self._semaphore:
+            await coordinator.blueair_api_device.refresh()
+
+    @property
+    def refresh_failing(self) -> bool:
+        """Return True while the account or any of its devices fails to refresh."""
+        return super().refresh_failing or bool(self._failed_ids)
+
+    async def _refresh_devices(self) -> int:
+        retry, self.refresh_retry = self.refresh_retry, False
+        # Devices whose MQTT push stream is healthy are already current.
+        coordinators = [c for c in self.coordinators if c.poll_needed]
+        if len(coordinators) < len(self.coordinators):
+            _LOGGER.debug(
+                "skipping REST refresh of %d device(s) kept current by MQTT",
+                len(self.coordinators) - len(coordinators),
+            )
+        # Only some devices failed last time; the others are current.
+        partial = retry and self.last_update_success and bool(self._failed_ids)
+        if partial:
+            coordinators = [c for c in coordinators if c.id in self._failed_ids]
+            _LOGGER.debug("retrying REST refresh of %d failed device(s)", len(coordinators))
+        results = await asyncio.gather(
+            *(self._refresh_device(coordinator) for coordinator in coordinators),
+            return_exceptions=True,
+        )
+        refreshed = 0
+        self._failed_ids = set()
+        for coordinator, result in zip(coordinators, results):
+            # A refresh cancelled from within is not a successful poll.
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if isinstance(result, BaseException):
+                self._failed_ids.add(coordinator.id)
+                coordinator.async_set_update_error(result)
+            else:
+                coordinator.record_poll()
+                coordinator.async_publish_device_state()
+                refreshed += 1
+        if coordinators and refreshed == 0 and not partial:
+            raise UpdateFailed(f"all {len(coordinators)} device refreshes failed")
+        return refreshed
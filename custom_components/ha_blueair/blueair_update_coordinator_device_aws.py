@@ -1,195 +1,290 @@
 """Blueair device object."""
 from __future__ import annotations
 
+import asyncio
 import logging
+import operator
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from functools import partial
 from math import ceil
+from time import monotonic
+from typing import Any
 from homeassistant.util.color import (
     value_to_brightness,
     brightness_to_value,
 )
 
 from blueair_api import DeviceAws
+from blueair_api.device_aws import SHADOW_FIELD_MAP
+
+from homeassistant.core import callback
 
 from .blueair_update_coordinator import BlueairUpdateCoordinator
+from .device_state import StateField
+from .const import (
+    MQTT_PUSH_FRESH_SECONDS,
+    MQTT_PUSH_MAX_POLL_SKIP_SECONDS,
+    STATE_CONFIRM_TIMEOUT_SECONDS,
+    STATE_CONFIRM_FALLBACK_SECONDS,
+    PUSH_STATUS_PENDING,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Matches any reported value of an attribute.
+_ANY_VALUE = object()
 
-class BlueairUpdateCoordinatorDeviceAws(BlueairUpdateCoordinator):
-    """Blueair device object."""
-    blueair_api_device: DeviceAws
+_NIGHT_LIGHT_BRIGHTNESS_SCALE = (1, 100)
 
-    @property
-    def model(self) -> str:
-        """Return human-readable product name for device registry."""
-        return self.blueair_api_device.model_name
 
-    @property
-    def hw_version(self) -> str:
-        return self.blueair_api_device.mcu_firmware
+def _pm(value: int) -> int:
+    return int((value * 100) // 132)
 
-    @property
-    def sw_version(self) -> str:
-        return self.blueair_api_device.firmware
 
-    @property
-    def overall_firmware(self) -> str | None | NotImplemented:
-        """Overall firmware version (AWS shadow field ``ofv``).
+def _life(usage_percentage: int) -> int:
+    return 100 - usage_percentage
 
-        Distinct from ``sw_version`` (Wi-Fi firmware) and ``hw_version``
-        (MCU firmware); surfaced as a diagnostic sensor since the device
-        registry only has the two version slots.
-        """
-        return self.blueair_api_device.overall_firmware
 
-    @property
-    def serial_number(self) -> str:
-        return self.blueair_api_device.serial_number
+def _brightness(value: int) -> float:
+    # Device brightness (0-100) to Home Assistant brightness (0-255).
+    return round(value / 100 * 255.0, 0)
 
-    @property
-    def fan_speed(self) -> int | None | NotImplemented:
-        """Return the current fan speed."""
-        return self.blueair_api_device.fan_speed
 
-    @property
-    def speed_count(self) -> int:
-        """Return the max fan speed."""
-        return self.blueair_api_device.fan_speed_count
+def _night_light_brightness(value: int) -> float:
+    return value_to_brightness(_NIGHT_LIGHT_BRIGHTNESS_SCALE, value)
 
-    @property
-    def is_on(self) -> bool | None | NotImplemented:
-        """Return the current fan state."""
-        if self.blueair_api_device.standby is None or self.blueair_api_device.standby is NotImplemented:
-            return self.blueair_api_device.standby
-        else:
-            return not self.blueair_api_device.standby
 
-    @property
-    def brightness(self) -> int | None | NotImplemented:
-        """Return the brightness of this light between 0..255."""
-        if self.blueair_api_device.brightness is None or self.blueair_api_device.brightness is NotImplemented:
-            return self.blueair_api_device.brightness
-        else:
-            return round(self.blueair_api_device.brightness / 100 * 255.0, 0)
-    @property
-    def germ_shield(self) -> bool | None | NotImplemented:
-        return self.blueair_api_device.germ_shield
+def _float(raw: Any) -> Any:
+    try:
+        return float(raw)
+    except (TypeError, ValueError):
+        return raw
 
-    @property
-    def child_lock(self) -> bool | None | NotImplemented:
-        return self.blueair_api_device.child_lock
 
-    @property
-    def night_mode(self) -> bool | None | NotImplemented:
-        return self.blueair_api_device.night_mode
+def _tenths(raw: Any) -> Any:
+    try:
+        return float(raw) / 10.0
+    except (TypeError, ValueError):
+        return raw
 
-    @property
-    def temperature(self) -> float | None | NotImplemented:
-        raw = self.blueair_api_device.temperature
-        if raw in (None, NotImplemented):
-            return raw
-        try:
-            return float(raw)
-        except (TypeError, ValueError):
-            return raw
 
-    @property
-    def humidity(self) -> int | None | NotImplemented:
-        return self.blueair_api_device.humidity
+def _int(raw: Any) -> Any:
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        return raw
 
-    @property
-    def auto_regulated_humidity(self) -> int | None | NotImplemented:
-        return self.blueair_api_device.auto_regulated_humidity
 
-    @property
-    def humidifier_mode(self) -> bool | None | NotImplemented:
-        """Humidification on/off for 2-in-1 combo devices (e.g. DH3i).
+class BlueairUpdateCoordinatorDeviceAws(BlueairUpdateCoordinator):
+    """Blueair device object."""
+    blueair_api_device: DeviceAws
 
-        Independent of the purifier running state (standby), so toggling
-        humidification does not power down the fan.
+    # Monotonic timestamps of the last MQTT message and the last REST poll.
+    # last_push is written from the MQTT thread; float assignment is atomic.
+    last_push: float | None = None
+    last_poll: float | None = None
+    # One of the PUSH_STATUS_* constants.
+    push_status: str = PUSH_STATUS_PENDING
+
+    state_table = BlueairUpdateCoordinator.state_table | {
+        # Overall firmware version (shadow field ``ofv``), distinct from
+        # sw_version (Wi-Fi firmware) and hw_version (MCU firmware); surfaced
+        # as a diagnostic sensor since the device registry only has the two
+        # version slots.
+        "overall_firmware": StateField(("overall_firmware",)),
+        "fan_speed": StateField(("fan_speed",)),
+        "is_on": StateField(("standby",), operator.not_),
+        "brightness": StateField(("brightness",), _brightness),
+        "germ_shield": StateField(("germ_shield",)),
+        "temperature": StateField(("temperature",), _float),
+        "humidity": StateField(("humidity",)),
+        "auto_regulated_humidity": StateField(("auto_regulated_humidity",)),
+        # Humidification on/off for 2-in-1 combo devices (e.g. DH3i),
+        # independent of the purifier running state (standby), so toggling
+        # humidification does not power down the fan.
+        "humidifier_mode": StateField(("humidifier_mode",)),
+        # Operating mode for 2-in-1 combo devices, following the firmware's
+        # mode enum: 1=Manual, 2=Auto, 3=Night.  Used to surface fan presets
+        # on the combo fan entity.
+        "combo_mode": StateField(("combo_mode",)),
+        "voc": StateField(("total_voc", "voc")),
+        "pm1": StateField(("pm1",), _pm),
+        # pm25 is the more common name for pm2.5.
+        "pm25": StateField(("pm2_5",), _pm),
+        "pm10": StateField(("pm10",), _pm),
+        "fan_auto_mode": StateField(("fan_auto_mode",)),
+        "wick_dry_mode": StateField(("wick_dry_mode",)),
+        "water_shortage": StateField(("water_shortage",)),
+        "filter_life": StateField(("filter_usage_percentage",), _life),
+        "wick_life": StateField(("wick_usage_percentage",), _life),
+        "water_refresher_life": StateField(("water_refresher_usage_percentage",), _life),
+        "water_level": StateField(("water_level",)),
+        "main_mode": StateField(("main_mode",)),
+        "heat_temp": StateField(("heat_temp",), _tenths),
+        "heat_sub_mode": StateField(("heat_sub_mode",)),
+        "heat_fan_speed": StateField(("heat_fan_speed",)),
+        "cool_sub_mode": StateField(("cool_sub_mode",)),
+        "cool_fan_speed": StateField(("cool_fan_speed",)),
+        "ap_sub_mode": StateField(("ap_sub_mode",)),
+        "fan_speed_0": StateField(("fan_speed_0",)),
+        "temperature_unit": StateField(("temperature_unit",), _int),
+        "rssi": StateField(("rssi",)),
+        "night_light_brightness": StateField(("night_light_brightness",), _night_light_brightness),
+        "timer_state": StateField(("timer_state",)),
+        "timer_duration": StateField(("timer_duration",)),
+        "hour_format": StateField(("hour_format",)),
+    }
+
+    def __init__(self, *args, **kwargs) -> None:
+        """Initialize the device."""
+        super().__init__(*args, **kwargs)
+        # Confirmations waiting for the device to report a state over MQTT,
+        # and when each attribute was last reported.
+        self._state_waiters: list[tuple[str, Any, asyncio.Future[None]]] = []
+        self._reported_at: dict[str, float] = {}
+
+    def record_push(self) -> None:
+        """Note that an MQTT message arrived for this device."""
+        self.last_push = monotonic()
+
+    def clear_push(self) -> None:
+        """Forget push freshness, e.g. after the MQTT connection dropped."""
+        self.last_push = None
+
+    @callback
+    def async_set_push_status(self, status: str) -> None:
+        """Record whether updates are pushed over MQTT."""
+        if status != self.push_status:
+            self.push_status = status
+            self.async_update_listeners()
+
+    def listener_status(self) -> tuple[Any, ...]:
+        return (*super().listener_status(), self.push_status)
+
+    def record_poll(self) -> None:
+        """Note that the device state was fetched over REST."""
+        self.last_poll = monotonic()
+
+    @property
+    def poll_needed(self) -> bool:
+        """Return False while the MQTT push stream keeps this device current.
+
+        A REST poll is still made every MQTT_PUSH_MAX_POLL_SKIP_SECONDS as a
+        safety net for anything the push stream does not carry.
         """
-        return self.blueair_api_device.humidifier_mode
-
-    @property
-    def combo_mode(self) -> int | None | NotImplemented:
-        """Operating mode for 2-in-1 combo devices (e.g. DH3i).
-
-        Values follow the device firmware's mode enum: 1=Manual, 2=Auto,
-        3=Night. Used to surface fan presets on the combo fan entity.
+        now = monotonic()
+        if self.last_push is None or now - self.last_push > MQTT_PUSH_FRESH_SECONDS:
+            return True
+        return self.last_poll is None or now - self.last_poll > MQTT_PUSH_MAX_POLL_SKIP_SECONDS
+
+    @asynccontextmanager
+    async def confirm_state(self, attribute: str, value: Any) -> AsyncIterator[None]:
+        """Wait after the block until the device reports attribute == value.
+
+        The wait ends on the matching MQTT state report, or after
+        STATE_CONFIRM_TIMEOUT_SECONDS.  Without an MQTT push stream there
+        is nothing to wait for, so a fixed STATE_CONFIRM_FALLBACK_SECONDS
+        delay is used instead.
         """
-        return self.blueair_api_device.combo_mode
-
-    @property
-    def voc(self) -> int | None | NotImplemented:
-        if self.blueair_api_device.total_voc is NotImplemented:
-            return self.blueair_api_device.voc
-        else:
-            return self.blueair_api_device.total_voc
-
-    @property
-    def pm1(self) -> int | None | NotImplemented:
-        pm1 = self.blueair_api_device.pm1
-        if pm1 is None or pm1 is NotImplemented:
-            return pm1
-        return int((pm1 * 100) // 132)
-
-    @property
-    def pm10(self) -> int | None | NotImplemented:
-        pm10 = self.blueair_api_device.pm10
-        if pm10 is None or pm10 is NotImplemented:
-            return pm10
-        return int((pm10 * 100) // 132)
-
-    @property
-    def pm25(self) -> int | None | NotImplemented:
-        # pm25 is the more common name for pm2.5.
-        pm25 = self.blueair_api_device.pm2_5
-        if pm25 is None or pm25 is NotImplemented:
-            return pm25
-        return int((pm25 * 100) // 132)
-
-    @property
-    def co2(self) -> int | None | NotImplemented:
-        return NotImplemented
-
-    @property
-    def fan_auto_mode(self) -> bool | None | NotImplemented:
-        return self.blueair_api_device.fan_auto_mode
-
-    @property
-    def wick_dry_mode(self) -> bool | None | NotImplemented:
-        return self.blueair_api_device.wick_dry_mode
+        if self.last_push is None:
+            yield
+            await asyncio.sleep(STATE_CONFIRM_FALLBACK_SECONDS)
+            return
+        # Registered before the write goes out so a fast report isn't missed.
+        entry = self._async_expect_report(attribute, value)
+        try:
+            yield
+            started = monotonic()
+            await asyncio.wait_for(entry[2], STATE_CONFIRM_TIMEOUT_SECONDS)
+            _LOGGER.debug(
+                f"{self.name}: {attribute}={value!r} confirmed after "
+                f"{monotonic() - started:.2f}s"
+            )
+        except TimeoutError:
+            _LOGGER.debug(f"{self.name}: {attribute}={value!r} not confirmed, continuing")
+        finally:
+            self._state_waiters.remove(entry)
+
+    @callback
+    def _async_expect_report(
+        self, attribute: str, value: Any = _ANY_VALUE
+    ) -> tuple[str, Any, asyncio.Future[None]]:
+        entry = (attribute, value, self.hass.loop.create_future())
+        self._state_waiters.append(entry)
+        return entry
+
+    @callback
+    def async_state_reported(self, state: dict[str, Any]) -> None:
+        """Resolve the confirmations matched by an MQTT state report."""
+        reported = {SHADOW_FIELD_MAP.get(field) for field in state}
+        now = monotonic()
+        for attribute in reported:
+            if attribute is not None:
+                self._reported_at[attribute] = now
+        for attribute, value, waiter in self._state_waiters:
+            if (
+                attribute in reported
+                and (value is _ANY_VALUE or getattr(self.blueair_api_device, attribute) == value)
+                and not waiter.done()
+            ):
+                waiter.set_result(None)
+
+    async def _async_writes_sent(self, sent: dict[str, float], failed: bool) -> None:
+        # The api device applied the written values locally; show them now.
+        self.async_publish_device_state()
+        if failed or self.last_push is None:
+            await self.async_request_refresh()
+            return
+        # The MQTT report of the new state makes a refresh unnecessary.
+        entries = [
+            self._async_expect_report(attribute)
+            for attribute, sent_at in sent.items()
+            if self._reported_at.get(attribute, 0) < sent_at
+        ]
+        if entries:
+            self.hass.async_create_background_task(
+                self._async_confirm_writes(entries), f"{self.name} confirm writes"
+            )
 
-    @property
-    def water_shortage(self) -> bool | None | NotImplemented:
-        return self.blueair_api_device.water_shortage
+    async def _async_confirm_writes(
+        self, entries: list[tuple[str, Any, asyncio.Future[None]]]
+    ) -> None:
+        try:
+            _, pending = await asyncio.wait(
+                [waiter for _, _, waiter in entries], timeout=STATE_CONFIRM_TIMEOUT_SECONDS
+            )
+        finally:
+            for entry in entries:
+                self._state_waiters.remove(entry)
+        if pending:
+            _LOGGER.debug(f"{self.name}: writes not confirmed over MQTT, refreshing")
+            # A push in the meantime cancels a debounced refresh, so the
+            # device is refreshed right away.
+            await self.async_refresh()
 
     @property
-    def filter_expired(self) -> bool | None | NotImplemented:
-        return NotImplemented
+    def model(self) -> str:
+        """Return human-readable product name for device registry."""
+        return self.blueair_api_device.model_name
 
     @property
-    def filter_life(self) -> int | None | NotImplemented:
-        if self.blueair_api_device.filter_usage_percentage in (NotImplemented, None):
-            return self.blueair_api_device.filter_usage_percentage
-        return 100 - self.blueair_api_device.filter_usage_percentage
+    def hw_version(self) -> str:
+        return self.data.mcu_firmware
 
     @property
-    def wick_life(self) -> int | None | NotImplemented:
-        if self.blueair_api_device.wick_usage_percentage in (NotImplemented, None):
-            return self.blueair_api_device.wick_usage_percentage
-        return 100 - self.blueair_api_device.wick_usage_percentage
+    def sw_version(self) -> str:
+        return self.data.firmware
 
     @property
-    def water_refresher_life(self) -> int | None | NotImplemented:
-        if self.blueair_api_device.water_refresher_usage_percentage in (NotImplemented, None):
-            return self.blueair_api_device.water_refresher_usage_percentage
-        return 100 - self.blueair_api_device.water_refresher_usage_percentage
+    def serial_number(self) -> str:
+        return self.data.serial_number
 
     @property
-    def water_level(self) -> int | None | NotImplemented:
-        return self.blueair_api_device.water_level
+    def speed_count(self) -> int:
+        """Return the max fan speed."""
+        return self.blueair_api_device.fan_speed_count
 
     @property
     def mood_brightness_scale(self) -> tuple[int, int]:
@@ -197,146 +292,85 @@ class BlueairUpdateCoordinatorDeviceAws(BlueairUpdateCoordinator):
 
     @property
     def mood_brightness(self) -> int | None | NotImplemented:
-        if self.blueair_api_device.mood_brightness not in (None, NotImplemented):
-            return value_to_brightness(self.mood_brightness_scale, self.blueair_api_device.mood_brightness)
-        return self.blueair_api_device.mood_brightness
+        if self.data.mood_brightness not in (None, NotImplemented):
+            return value_to_brightness(self.mood_brightness_scale, self.data.mood_brightness)
+        return self.data.mood_brightness
 
     @property
     def mood_brightness_is_on(self) -> int | None | NotImplemented:
-        return self.blueair_api_device.mood_brightness != 0
-
-    @property
-    def main_mode(self) -> int | None | NotImplemented:
-        return self.blueair_api_device.main_mode
-
-    @property
-    def heat_temp(self) -> float | None | NotImplemented:
-        raw = self.blueair_api_device.heat_temp
-        if raw in (None, NotImplemented):
-            return raw
-        try:
-            return float(raw) / 10.0
-        except (TypeError, ValueError):
-            return raw
-
-    @property
-    def heat_sub_mode(self) -> int | None | NotImplemented:
-        return self.blueair_api_device.heat_sub_mode
-
-    @property
-    def heat_fan_speed(self) -> int | None | NotImplemented:
-        return self.blueair_api_device.heat_fan_speed
-
-    @property
-    def cool_sub_mode(self) -> int | None | NotImplemented:
-        return self.blueair_api_device.cool_sub_mode
-
-    @property
-    def cool_fan_speed(self) -> int | None | NotImplemented:
-        return self.blueair_api_device.cool_fan_speed
-
-    @property
-    def ap_sub_mode(self) -> int | None | NotImplemented:
-        return self.blueair_api_device.ap_sub_mode
-
-    @property
-    def fan_speed_0(self) -> int | None | NotImplemented:
-        return self.blueair_api_device.fan_speed_0
-
-    @property
-    def temperature_unit(self) -> int | None | NotImplemented:
-        raw = self.blueair_api_device.temperature_unit
-        if raw in (None, NotImplemented):
-            return raw
-        try:
-            return int(raw)
-        except (TypeError, ValueError):
-            return raw
-
-    @property
-    def rssi(self) -> int | None | NotImplemented:
-        return self.blueair_api_device.rssi
+        return self.data.mood_brightness != 0
 
     @property
     def night_light_brightness_scale(self) -> tuple[int, int]:
-        return (1, 100)
-
-    @property
-    def night_light_brightness(self) -> int | None | NotImplemented:
-        if self.blueair_api_device.night_light_brightness not in (None, NotImplemented):
-            return value_to_brightness(
-                self.night_light_brightness_scale,
-                self.blueair_api_device.night_light_brightness,
-            )
-        return self.blueair_api_device.night_light_brightness
+        return _NIGHT_LIGHT_BRIGHTNESS_SCALE
 
     @property
     def night_light_brightness_is_on(self) -> bool | None | NotImplemented:
-        return self.blueair_api_device.night_light_brightness != 0
-
-    @property
-    def timer_state(self) -> int | None | NotImplemented:
-        return self.blueair_api_device.timer_state
-
-    @property
-    def timer_duration(self) -> int | None | NotImplemented:
-        return self.blueair_api_device.timer_duration
-
-    @property
-    def hour_format(self) -> bool | None | NotImplemented:
-        return self.blueair_api_device.hour_format
+        return self.data.night_light_brightness != 0
 
     async def set_running(self, running) -> None:
-        await self.blueair_api_device.set_standby(not running)
-        await self.async_request_refresh()
+        await self._async_write(
+            "standby", partial(self.blueair_api_device.set_standby, not running)
+        )
 
     async def set_brightness(self, brightness) -> None:
         # Convert Home Assistant brightness (0-255) to Abode brightness (0-99)
         # If 100 is sent to Abode, response is 99 causing an error
-        await self.blueair_api_device.set_brightness(round(brightness * 100 / 255.0))
-        await self.async_request_refresh()
+        await self._async_write(
+            "brightness", partial(self.blueair_api_device.set_brightness, round(brightness * 100 / 255.0))
+        )
 
     async def set_mood_brightness(self, mood_brightness) -> None:
         desired_brightness_in_range = ceil(brightness_to_value(self.mood_brightness_scale, mood_brightness))
 
-        await self.blueair_api_device.set_mood_brightness(desired_brightness_in_range)
-        await self.async_request_refresh()
+        await self._async_write(
+            "mood_brightness", partial(self.blueair_api_device.set_mood_brightness, desired_brightness_in_range)
+        )
 
     async def turn_off_mood_brightness(self) -> None:
-        await self.blueair_api_device.set_mood_brightness(0)
-        await self.async_request_refresh()
+        await self._async_write(
+            "mood_brightness", partial(self.blueair_api_device.set_mood_brightness, 0)
+        )
 
     async def set_germ_shield(self, enabled: bool) -> None:
-        await self.blueair_api_device.set_germ_shield(enabled)
-        await self.async_request_refresh()
+        await self._async_write(
+            "germ_shield", partial(self.blueair_api_device.set_germ_shield, enabled)
+        )
 
     async def set_night_mode(self, mode) -> None:
-        await self.blueair_api_device.set_night_mode(mode)
-        await self.async_request_refresh()
+        await self._async_write(
+            "night_mode", partial(self.blueair_api_device.set_night_mode, mode)
+        )
 
     async def set_fan_auto_mode(self, value: bool) -> None:
-        await self.blueair_api_device.set_fan_auto_mode(value)
-        await self.async_request_refresh()
+        await self._async_write(
+            "fan_auto_mode", partial(self.blueair_api_device.set_fan_auto_mode, value)
+        )
 
     async def set_wick_dry_mode(self, value) -> None:
-        await self.blueair_api_device.set_wick_dry_mode(value)
-        await self.async_request_refresh()
+        await self._async_write(
+            "wick_dry_mode", partial(self.blueair_api_device.set_wick_dry_mode, value)
+        )
 
     async def set_auto_regulated_humidity(self, value) -> None:
-        await self.blueair_api_device.set_auto_regulated_humidity(value)
-        await self.async_request_refresh()
+        await self._async_write(
+            "auto_regulated_humidity", partial(self.blueair_api_device.set_auto_regulated_humidity, value)
+        )
 
     async def set_humidifier_mode(self, value: bool) -> None:
-        await self.blueair_api_device.set_humidifier_mode(value)
-        await self.async_request_refresh()
+        await self._async_write(
+            "humidifier_mode", partial(self.blueair_api_device.set_humidifier_mode, value)
+        )
 
     async def set_combo_mode(self, value: int) -> None:
-        await self.blueair_api_device.set_combo_mode(value)
-        await self.async_request_refresh()
+        await self._async_write(
+            "combo_mode", partial(self.blueair_api_device.set_combo_mode, value)
+        )
 
     async def set_main_mode(self, value: int) -> None:
-        await self.blueair_api_device.set_main_mode(value)
-        await self.async_request_refresh()
+        await self._async_write(
+            "main_mode", partial(self.blueair_api_device.set_main_mode, value)
+        )
 
     async def set_heat_temp(self, value: int | float) -> None:
         if value in (None, NotImplemented):
@@ -346,48 +380,59 @@ class BlueairUpdateCoordinatorDeviceAws(BlueairUpdateCoordinator):
         except (TypeError, ValueError):
             return
         payload = int(round(v * 10))
-        await self.blueair_api_device.set_heat_temp(payload)
-        await self.async_request_refresh()
+        await self._async_write(
+            "heat_temp", partial(self.blueair_api_device.set_heat_temp, payload)
+        )
 
     async def set_heat_sub_mode(self, value: int) -> None:
-        await self.blueair_api_device.set_heat_sub_mode(value)
-        await self.async_request_refresh()
+        await self._async_write(
+            "heat_sub_mode", partial(self.blueair_api_device.set_heat_sub_mode, value)
+        )
 
     async def set_heat_fan_speed(self, value: int) -> None:
-        await self.blueair_api_device.set_heat_fan_speed(value)
-        await self.async_request_refresh()
+        await self._async_write(
+            "heat_fan_speed", partial(self.blueair_api_device.set_heat_fan_speed, value)
+        )
 
     async def set_cool_sub_mode(self, value: int) -> None:
-        await self.blueair_api_device.set_cool_sub_mode(value)
-        await self.async_request_refresh()
+        await self._async_write(
+            "cool_sub_mode", partial(self.blueair_api_device.set_cool_sub_mode, value)
+        )
 
     async def set_cool_fan_speed(self, value: int) -> None:
-        await self.blueair_api_device.set_cool_fan_speed(value)
-        await self.async_request_refresh()
+        await self._async_write(
+            "cool_fan_speed", partial(self.blueair_api_device.set_cool_fan_speed, value)
+        )
 
     async def set_ap_sub_mode(self, value: int) -> None:
-        await self.blueair_api_device.set_ap_sub_mode(value)
-        await self.async_request_refresh()
+        await self._async_write(
+            "ap_sub_mode", partial(self.blueair_api_device.set_ap_sub_mode, value)
+        )
 
     async def set_fan_speed_0(self, value: int) -> None:
-        await self.blueair_api_device.set_fan_speed_0(value)
-        await self.async_request_refresh()
+        await self._async_write(
+            "fan_speed_0", partial(self.blueair_api_device.set_fan_speed_0, value)
+        )
 
     async def set_night_light_brightness(self, night_light_brightness) -> None:
         desired_brightness_in_range = ceil(
             brightness_to_value(self.night_light_brightness_scale, night_light_brightness)
         )
-        await self.blueair_api_device.set_night_light_brightness(desired_brightness_in_range)
-        await self.async_request_refresh()
+        await self._async_write(
+            "night_light_brightness", partial(self.blueair_api_device.set_night_light_brightness, desired_brightness_in_range)
+        )
 
     async def turn_off_night_light_brightness(self) -> None:
-        await self.blueair_api_device.set_night_light_brightness(0)
-        await self.async_request_refresh()
+        await self._async_write(
+            "night_light_brightness", partial(self.blueair_api_device.set_night_light_brightness, 0)
+        )
 
     async def set_timer_duration(self, value: int) -> None:
-        await self.blueair_api_device.set_timer_duration(value)
-        await self.async_request_refresh()
+        await self._async_write(
+            "timer_duration", partial(self.blueair_api_device.set_timer_duration, value)
+        )
 
     async def set_hour_format(self, value: bool) -> None:
-        await self.blueair_api_device.set_hour_format(value)
-        await self.async_request_refresh()
+        await self._async_write(
+            "hour_format", partial(self.blueair_api_device.set_hour_format, value)
+        )
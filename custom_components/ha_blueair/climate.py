@@ -78,8 +78,8 @@ class BlueairThermostat(BlueairEntity, ClimateEntity):
     @classmethod
     def is_implemented(cls, coordinator: BlueairUpdateCoordinator) -> bool:
         return (
-            coordinator.main_mode is not NotImplemented
-            and coordinator.temperature is not NotImplemented
+            coordinator.implements("main_mode")
+            and coordinator.implements("temperature")
         )
 
     _enable_turn_on_off_backwards_compatibility = False
@@ -10,6 +10,7 @@ from homeassistant.const import (
     CONF_SCAN_INTERVAL,
 )
 from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .const import (
     DOMAIN,
@@ -17,9 +18,17 @@ from .const import (
     REGIONS,
     REGION_USA,
     DEFAULT_SCAN_INTERVAL,
+    CONF_POLL_JITTER,
+    DEFAULT_POLL_JITTER,
+    CONF_MAX_STALE_MINUTES,
+    DEFAULT_MAX_STALE_MINUTES,
+    CONF_MQTT_SHARDS,
+    DEFAULT_MQTT_SHARDS,
+    MAX_MQTT_SHARDS,
+    DATA_FLOW_LOGINS,
 )
 
-from blueair_api import AuthError, get_aws_devices
+from blueair_api import AuthError, HttpAwsBlueair
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -37,6 +46,24 @@ class OptionFlowHandler(config_entries.OptionsFlow):
                         CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
                     ),
                 ): vol.All(vol.Coerce(int), vol.Range(min=1, max=30)),
+                vol.Required(
+                    CONF_POLL_JITTER,
+                    default=config_entry.options.get(
+                        CONF_POLL_JITTER, DEFAULT_POLL_JITTER
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=60)),
+                vol.Required(
+                    CONF_MAX_STALE_MINUTES,
+                    default=config_entry.options.get(
+                        CONF_MAX_STALE_MINUTES, DEFAULT_MAX_STALE_MINUTES
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1440)),
+                vol.Required(
+                    CONF_MQTT_SHARDS,
+                    default=config_entry.options.get(
+                        CONF_MQTT_SHARDS, DEFAULT_MQTT_SHARDS
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_MQTT_SHARDS)),
             }
         )
 
@@ -82,21 +109,28 @@ class ConfigFlowHandler(config_entries.ConfigFlow):
             username = user_input[CONF_USERNAME]
             password = user_input[CONF_PASSWORD]
 
-            api_cloud = None
+            api_cloud = HttpAwsBlueair(
+                username=username,
+                password=password,
+                region=region,
+                client_session=async_get_clientsession(self.hass),
+            )
             try:
-                api_cloud, _devices = await get_aws_devices(username=username, password=password, region=region)
+                api_devices = await api_cloud.devices()
                 self.data.update(user_input)
                 await self.async_set_unique_id(username)
                 self._abort_if_unique_id_configured()
+                # The first setup of the entry continues with this login
+                # and device list instead of fetching them again.
+                self.hass.data.setdefault(DOMAIN, {}).setdefault(DATA_FLOW_LOGINS, {})[
+                    username
+                ] = (api_cloud, api_devices)
                 return self.async_create_entry(
                     title=username,
                     data=self.data,
                 )
             except AuthError:
                 errors["base"] = "auth"
-            finally:
-                if api_cloud is not None:
-                    await api_cloud.cleanup_client_session()
 
         return self.async_show_form(
             step_id="user", data_schema=vol.Schema(data_schema), errors=errors
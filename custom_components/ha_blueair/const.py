@@ -7,6 +7,58 @@ DOMAIN: str = "ha_blueair"
 # Integration Setting Constants
 CONFIG_FLOW_VERSION: int = 2
 DEFAULT_SCAN_INTERVAL: int = 5
+CONF_POLL_JITTER: str = "poll_jitter"
+DEFAULT_POLL_JITTER: int = 10
+# How long the last good state is served while refreshes keep failing.
+CONF_MAX_STALE_MINUTES: str = "max_stale_minutes"
+DEFAULT_MAX_STALE_MINUTES: int = 30
+# Number of MQTT connections the AWS devices of an account are spread over.
+CONF_MQTT_SHARDS: str = "mqtt_shards"
+DEFAULT_MQTT_SHARDS: int = 1
+MAX_MQTT_SHARDS: int = 16
+# First retry after a failed refresh; doubles up to the scan interval.
+REFRESH_RETRY_SECONDS: int = 30
+# Maximum number of devices a config entry refreshes at once.
+REFRESH_CONCURRENCY: int = 4
+# While an AWS device has pushed over MQTT within this many seconds its
+# scheduled REST poll is skipped, up to the safety-net poll age below.
+MQTT_PUSH_FRESH_SECONDS: int = 120
+MQTT_PUSH_MAX_POLL_SKIP_SECONDS: int = 3600
+# How long a write waits for the device to report the new state over MQTT,
+# and the fixed wait used when there is no MQTT push stream.
+STATE_CONFIRM_TIMEOUT_SECONDS: int = 5
+STATE_CONFIRM_FALLBACK_SECONDS: int = 2
+# Whether an AWS device gets its updates pushed over MQTT: not yet known
+# while MQTT starts, over a connected or disconnected MQTT shard, or by
+# polling only.
+PUSH_STATUS_PENDING: str = "pending"
+PUSH_STATUS_CONNECTED: str = "connected"
+PUSH_STATUS_DISCONNECTED: str = "disconnected"
+PUSH_STATUS_POLLING: str = "polling"
+# MQTT updates arriving within this window reach the event loop together.
+MQTT_FLUSH_WINDOW_SECONDS: float = 0.25
+# MQTT credentials are refreshed this long before they expire, and again
+# after a failed refresh.  Each connection is then replaced by one made
+# with the new credentials, given this long to come up.
+MQTT_CREDENTIAL_REFRESH_MARGIN_SECONDS: int = 600
+MQTT_CREDENTIAL_RETRY_SECONDS: int = 60
+MQTT_HANDOVER_TIMEOUT_SECONDS: int = 30
+# A token refresh this soon after a login gets that login's tokens.
+TOKEN_REFRESH_REUSE_SECONDS: int = 30
+# A reconcile of restored devices that can't reach the cloud is retried
+# after this many seconds, doubling up to the maximum.
+RECONCILE_RETRY_SECONDS: int = 30
+RECONCILE_RETRY_MAX_SECONDS: int = 1800
+# Seconds to coalesce device updates before the snapshot is written.
+SNAPSHOT_SAVE_DELAY: int = 60
+# Seconds after a login before it is stored.
+TOKEN_SAVE_DELAY: int = 1
+# Accounts whose legacy cloud listed no devices skip it at setup, and it
+# is listed again in the background this often.
+LEGACY_RECHECK_HOURS: int = 24
+# A legacy login can also fail for a while on an account with devices, so
+# the cloud is only skipped once it refused this many logins in a row.
+LEGACY_LOGIN_FAILURES: int = 3
 PLATFORMS = [
     Platform.BINARY_SENSOR,
     Platform.CLIMATE,
@@ -28,7 +80,13 @@ class FanMode(Enum):
 # Home Assistant Data Storage Constants
 DATA_DEVICES: str = "api_devices"
 DATA_AWS_DEVICES: str = "api_aws_devices"
-DATA_MQTT_CLIENT: str = "mqtt_client"
+DATA_MQTT_SHARDS: str = "mqtt_shards"
+DATA_MQTT_CREDENTIALS: str = "mqtt_credentials"
+DATA_TOKEN_MANAGER: str = "token_manager"
+DATA_ACCOUNT: str = "account"
+# hass.data key of the logins made by the config flow, by username, until
+# the entry they created is set up.
+DATA_FLOW_LOGINS: str = "flow_logins"
 
 REGION_EU = "eu"
 REGION_USA = "us"
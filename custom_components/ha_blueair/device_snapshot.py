@@ -0,0 +1,141 @@
+"""Persists the last known Blueair devices so setup does not wait on the cloud.
+
+The snapshot holds every dataclass field of each api device (identity,
+model capabilities such as ``sku`` and ``hw``, and the last state) and is
+written with a delay whenever a coordinator updates.  On the next start
+the devices are rebuilt from it around api clients that have not logged
+in yet; they log in on first use.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import fields
+from datetime import datetime
+from typing import Any
+
+from blueair_api import Device, DeviceAws, HttpAwsBlueair, HttpBlueair
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .blueair_update_coordinator import BlueairUpdateCoordinator
+from .const import DOMAIN, SNAPSHOT_SAVE_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# The client, and raw sensor history only the next refresh reads.
+_SKIPPED_FIELDS = {"api", "raw_sensors"}
+
+
+def _dump_device(device: Device | DeviceAws) -> dict[str, Any]:
+    values = {}
+    not_implemented = []
+    for field in fields(device):
+        if field.name in _SKIPPED_FIELDS or not hasattr(device, field.name):
+            continue
+        value = getattr(device, field.name)
+        if value is NotImplemented:
+            not_implemented.append(field.name)
+        else:
+            values[field.name] = value
+    return {"fields": values, "not_implemented": not_implemented}
+
+
+def _load_device[T: (Device, DeviceAws)](
+    cls: type[T], api: HttpBlueair | HttpAwsBlueair, stored: dict[str, Any]
+) -> T:
+    values = dict(stored["fields"])
+    values.update(dict.fromkeys(stored["not_implemented"], NotImplemented))
+    init_values = {}
+    later_values = {}
+    # Fields the installed blueair-api no longer has are dropped.
+    for field in fields(cls):
+        if field.name in _SKIPPED_FIELDS or field.name not in values:
+            continue
+        if field.init:
+            init_values[field.name] = values[field.name]
+        else:
+            later_values[field.name] = values[field.name]
+    device = cls(api=api, **init_values)
+    for name, value in later_values.items():
+        setattr(device, name, value)
+    return device
+
+
+class DeviceSnapshot:
+    """Last known devices of one config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the snapshot."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.devices"
+        )
+        self._coordinators: list[BlueairUpdateCoordinator] = []
+        self._save_pending = False
+        self._removed = False
+
+    async def async_load(
+        self, http_client: HttpBlueair, aws_http_client: HttpAwsBlueair
+    ) -> tuple[list[Device], list[DeviceAws], dict[str, datetime]] | None:
+        """Rebuild the stored devices around the given clients.
+
+        Also returns when each device was last refreshed, by uuid.
+        """
+        stored = await self._store.async_load()
+        if stored is None:
+            return None
+        try:
+            devices = [_load_device(Device, http_client, d) for d in stored["devices"]]
+            aws_devices = [
+                _load_device(DeviceAws, aws_http_client, d) for d in stored["aws_devices"]
+            ]
+            last_updated = {
+                d["fields"]["uuid"]: dt_util.parse_datetime(d["last_updated"])
+                for d in stored["devices"] + stored["aws_devices"]
+                if d.get("last_updated")
+            }
+        except (KeyError, TypeError, ValueError) as error:
+            _LOGGER.warning(f"Ignoring unreadable device snapshot: {error}")
+            return None
+        return devices, aws_devices, last_updated
+
+    @callback
+    def async_track(self, coordinators: list[BlueairUpdateCoordinator]) -> None:
+        """Save the devices of these coordinators whenever they update."""
+        self._coordinators = coordinators
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Save the snapshot after a delay, coalescing further updates."""
+        # Rescheduling on every update would postpone the write for as
+        # long as MQTT keeps pushing.
+        if not self._save_pending and not self._removed:
+            self._save_pending = True
+            self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        self._save_pending = False
+        devices = []
+        aws_devices = []
+        for coordinator in self._coordinators:
+            # Devices that never refreshed have nothing worth keeping.
+            if not coordinator.has_device_state:
+                continue
+            device = coordinator.blueair_api_device
+            stored = _dump_device(device)
+            if coordinator.last_success_time is not None:
+                stored["last_updated"] = coordinator.last_success_time.isoformat()
+            if isinstance(device, DeviceAws):
+                aws_devices.append(stored)
+            else:
+                devices.append(stored)
+        return {"devices": devices, "aws_devices": aws_devices}
+
+    async def async_remove(self) -> None:
+        """Delete the stored snapshot; it is not saved again."""
+        self._removed = True
+        await self._store.async_remove()
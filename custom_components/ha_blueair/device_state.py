@@ -0,0 +1,73 @@
+"""Immutable snapshots of api device state, used as coordinator data.
+
+The api devices are mutable dataclasses that the MQTT thread writes to.
+Each coordinator update takes a snapshot of their state fields into a
+named tuple, so entities read one consistent state and unchanged updates
+are detected with a plain tuple comparison.
+
+The coordinators describe their state properties as a table of
+``StateField``; ``convert_state`` evaluates the table once per snapshot.
+"""
+from __future__ import annotations
+
+from collections import namedtuple
+from collections.abc import Callable
+from dataclasses import dataclass, fields
+from functools import cache
+from operator import attrgetter
+from typing import Any
+
+from blueair_api import Device, DeviceAws
+
+
+@cache
+def _state_type(
+    device_type: type[Device | DeviceAws],
+) -> tuple[type[tuple[Any, ...]], Callable[[Device | DeviceAws], tuple[Any, ...]]]:
+    # The fields shown in the device repr are its state; the rest are
+    # clients, raw responses and schema data.  All of them have defaults.
+    names = [field.name for field in fields(device_type) if field.repr]
+    return namedtuple(f"{device_type.__name__}State", names), attrgetter(*names)
+
+
+def device_state(device: Device | DeviceAws) -> tuple[Any, ...]:
+    """Return a snapshot of the device's state fields."""
+    state_type, get_fields = _state_type(type(device))
+    return state_type._make(get_fields(device))
+
+
+@dataclass(frozen=True, slots=True)
+class StateField:
+    """How a coordinator property is read from the device state.
+
+    The value comes from the first of ``sources`` the device implements
+    and goes through ``transform`` unless it is None or NotImplemented.
+    With ``models`` set, only those models implement the property.
+    """
+
+    sources: tuple[str, ...]
+    transform: Callable[[Any], Any] | None = None
+    models: frozenset[str] | None = None
+
+
+def convert_state(
+    state: tuple[Any, ...], table: dict[str, StateField], model: str
+) -> dict[str, Any]:
+    """Return the value of every property in the table that the model implements."""
+    values = {}
+    for name, field in table.items():
+        if field.models is not None and model not in field.models:
+            continue
+        for source in field.sources:
+            value = getattr(state, source)
+            if value is not NotImplemented:
+                break
+        if field.transform is not None and value is not None and value is not NotImplemented:
+            value = field.transform(value)
+        values[name] = value
+    return values
+
+
+def state_fields(device_type: type[Device | DeviceAws]) -> tuple[str, ...]:
+    """Return the names of the state fields of a device type."""
+    return _state_type(device_type)[0]._fields
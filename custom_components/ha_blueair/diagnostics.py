@@ -11,7 +11,14 @@ from homeassistant.const import CONF_UNIQUE_ID, CONF_EMAIL, CONF_PASSWORD
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry as dr, entity_registry as er
 
-from .const import DOMAIN, DATA_DEVICES, DATA_AWS_DEVICES
+from .const import (
+    DOMAIN,
+    DATA_DEVICES,
+    DATA_AWS_DEVICES,
+    DATA_MQTT_SHARDS,
+    DATA_MQTT_CREDENTIALS,
+    DATA_TOKEN_MANAGER,
+)
 from .blueair_update_coordinator_device import BlueairUpdateCoordinatorDevice
 from .blueair_update_coordinator_device_aws import BlueairUpdateCoordinatorDeviceAws
 
@@ -27,17 +34,25 @@ async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, config_entry: ConfigEntry
 ) -> dict[str, dict[str, Any]]:
     """Return diagnostics for a config entry."""
-    device_coordinators: list[BlueairUpdateCoordinatorDevice] = hass.data[DOMAIN][DATA_DEVICES]
-    device_aws_coordinators: list[BlueairUpdateCoordinatorDeviceAws] = hass.data[DOMAIN][DATA_AWS_DEVICES]
+    device_coordinators: list[BlueairUpdateCoordinatorDevice] = config_entry.runtime_data[DATA_DEVICES]
+    device_aws_coordinators: list[BlueairUpdateCoordinatorDeviceAws] = config_entry.runtime_data[DATA_AWS_DEVICES]
     coordinators = device_coordinators + device_aws_coordinators
+    credentials = config_entry.runtime_data[DATA_MQTT_CREDENTIALS]
     data = {
         "entry": async_redact_data(config_entry.as_dict(), TO_REDACT),
+        "mqtt_shards": [
+            shard.diagnostics() for shard in config_entry.runtime_data[DATA_MQTT_SHARDS]
+        ],
+        "mqtt_credentials": credentials.diagnostics() if credentials is not None else None,
+        "token_refresh": config_entry.runtime_data[DATA_TOKEN_MANAGER].diagnostics(),
     }
     for coordinator in coordinators:
         data[coordinator.blueair_api_device.mac] = {
             "device_str": str(coordinator.blueair_api_device),
             "raw_info": coordinator.blueair_api_device.raw_info,
         }
+        if isinstance(coordinator, BlueairUpdateCoordinatorDeviceAws):
+            data[coordinator.blueair_api_device.mac]["push_status"] = coordinator.push_status
 
         device_registry = dr.async_get(hass)
         entity_registry = er.async_get(hass)
@@ -1,5 +1,6 @@
 """Base entity class for Blueair entities."""
 import logging
+from typing import Any
 
 from propcache import cached_property
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC
@@ -13,6 +14,9 @@ from .blueair_update_coordinator_device import BlueairUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
+# Set while refreshes fail and the last good state is being served.
+ATTR_STALE_SINCE = "stale_since"
+
 # Module-level set of coordinator UUIDs we've already warned about for a
 # missing MAC.  Keeps the log from spamming once per entity (~10 entities
 # per coordinator).  See the issue linked in `device_info` below.
@@ -21,8 +25,8 @@ _MAC_MISSING_WARNED: set[str] = set()
 
 def async_setup_entry_helper(hass, config_entry, async_add_entities, entity_classes):
     coordinators: list[BlueairUpdateCoordinator] = []
-    coordinators.extend(hass.data[DOMAIN][DATA_DEVICES])
-    coordinators.extend(hass.data[DOMAIN][DATA_AWS_DEVICES])
+    coordinators.extend(config_entry.runtime_data[DATA_DEVICES])
+    coordinators.extend(config_entry.runtime_data[DATA_AWS_DEVICES])
 
     entities = []
     for coordinator in coordinators:
@@ -36,19 +40,32 @@ def async_setup_entry_helper(hass, config_entry, async_add_entities, entity_clas
 class BlueairEntity(CoordinatorEntity[BlueairUpdateCoordinator]):
     """A base class for Blueair entities."""
     _attr_translation_key = DOMAIN
+    _unrecorded_attributes = frozenset({ATTR_STALE_SINCE})
 
     @classmethod
     def is_implemented(kls, coordinator) -> bool:
        """Returns true if the coordinator supports this entity."""
        raise NotImplementedError
 
+    def coordinator_properties(self) -> tuple[str, ...] | None:
+        """Return the coordinator properties the state is built from.
+
+        The entity is only updated when the device fields behind them
+        change; None updates it on every coordinator update.
+        """
+        return None
+
     def __init__(
         self,
         entity_type: str,
         coordinator: BlueairUpdateCoordinator,
         **kwargs,
     ) -> None:
-        super().__init__(coordinator)
+        properties = self.coordinator_properties()
+        super().__init__(
+            coordinator,
+            context=None if properties is None else coordinator.state_fields_for(properties),
+        )
         self._attr_name = f"{coordinator.device_name} {entity_type}"
         self._attr_unique_id = f"{coordinator.id}_{entity_type}"
 
@@ -89,4 +106,11 @@ class BlueairEntity(CoordinatorEntity[BlueairUpdateCoordinator]):
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.coordinator.last_update_success and self.coordinator.online
+        return self.coordinator.data_available and self.coordinator.online
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return when the state was last refreshed if it is stale."""
+        if self.coordinator.last_update_success or self.coordinator.last_success_time is None:
+            return None
+        return {ATTR_STALE_SINCE: self.coordinator.last_success_time.isoformat()}
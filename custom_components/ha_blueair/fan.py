@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 import logging
-from asyncio import sleep
 from homeassistant.components.fan import (
     FanEntity,
     FanEntityFeature,
@@ -74,9 +73,9 @@ class BlueairFan(BlueairEntity, FanEntity):
     def __init__(self, coordinator: BlueairUpdateCoordinator):
         """Initialize the fan entity."""
         self._attr_preset_modes = []
-        if coordinator.fan_auto_mode is not NotImplemented:
+        if coordinator.implements("fan_auto_mode"):
             self._attr_preset_modes.append(MODE_AUTO)
-        if coordinator.night_mode is not NotImplemented:
+        if coordinator.implements("night_mode"):
             self._attr_preset_modes.append(MODE_NIGHT)
 
         self._attr_supported_features = FanEntityFeature.SET_SPEED | FanEntityFeature.TURN_ON | FanEntityFeature.TURN_OFF
@@ -178,9 +177,9 @@ class BlueairAwsFan(BlueairEntity, FanEntity):
         Issues: dahlb/ha_blueair#348 and #261.
         """
         return (
-            coordinator.ap_sub_mode is not NotImplemented
-            and coordinator.fan_auto_mode is NotImplemented
-            and coordinator.night_mode is NotImplemented
+            coordinator.implements("ap_sub_mode")
+            and not coordinator.implements("fan_auto_mode")
+            and not coordinator.implements("night_mode")
         )
 
     @staticmethod
@@ -194,7 +193,7 @@ class BlueairAwsFan(BlueairEntity, FanEntity):
 
         Issue: dahlb/ha_blueair#241.
         """
-        return coordinator.combo_mode is not NotImplemented
+        return coordinator.implements("combo_mode")
 
     def __init__(self, coordinator: BlueairUpdateCoordinatorDeviceAws):
         """Initialize the fan entity."""
@@ -232,13 +231,13 @@ class BlueairAwsFan(BlueairEntity, FanEntity):
             # 2-in-1 combo devices: Manual / Auto / Night via combo_mode.
             self._attr_preset_modes = list(_COMBO_MODE_TO_LABEL.values())
         else:
-            if coordinator.fan_auto_mode is not NotImplemented:
+            if coordinator.implements("fan_auto_mode"):
                 self._attr_preset_modes.append(MODE_AUTO)
-            if coordinator.night_mode is not NotImplemented:
+            if coordinator.implements("night_mode"):
                 self._attr_preset_modes.append(MODE_NIGHT)
 
         self._attr_supported_features = FanEntityFeature.TURN_ON | FanEntityFeature.TURN_OFF
-        if coordinator.fan_speed is not NotImplemented:
+        if coordinator.implements("fan_speed"):
             self._attr_supported_features |= FanEntityFeature.SET_SPEED
         if len(self._attr_preset_modes) > 0:
             self._attr_supported_features |= FanEntityFeature.PRESET_MODE
@@ -308,10 +307,11 @@ class BlueairAwsFan(BlueairEntity, FanEntity):
                 )
             except (TypeError, ValueError):
                 already_manual = False
-            if not already_manual:
-                await self.coordinator.set_ap_sub_mode(manual_value)
             blueair_percentage = int(round(percentage / 100 * self.coordinator.speed_count))
-            await self.coordinator.set_fan_speed(blueair_percentage)
+            async with self.coordinator.batch():
+                if not already_manual:
+                    await self.coordinator.set_ap_sub_mode(manual_value)
+                await self.coordinator.set_fan_speed(blueair_percentage)
             self.async_write_ha_state()
             return
 
@@ -329,19 +329,20 @@ class BlueairAwsFan(BlueairEntity, FanEntity):
                 )
             except (TypeError, ValueError):
                 already_manual = False
-            if not already_manual:
-                await self.coordinator.set_combo_mode(manual_value)
             blueair_percentage = int(round(percentage / 100 * self.coordinator.speed_count))
-            await self.coordinator.set_fan_speed(blueair_percentage)
+            async with self.coordinator.batch():
+                if not already_manual:
+                    await self.coordinator.set_combo_mode(manual_value)
+                await self.coordinator.set_fan_speed(blueair_percentage)
             self.async_write_ha_state()
             return
 
         if self.coordinator.fan_auto_mode is True:
             await self.coordinator.set_fan_auto_mode(False)
         if self.coordinator.night_mode is True:
-            await self.coordinator.set_night_mode(False)
             # need to wait when turning off night mode for device to receive message from aws then it sets the speed to what night mode had set and updates aws with that speed, without this wait the following set is overridden by the device
-            await sleep(2)
+            async with self.coordinator.confirm_state("night_mode", False):
+                await self.coordinator.set_night_mode(False)
         blueair_percentage = int(round(percentage / 100 * self.coordinator.speed_count))
         await self.coordinator.set_fan_speed(blueair_percentage)
         self.async_write_ha_state()
@@ -362,14 +363,15 @@ class BlueairAwsFan(BlueairEntity, FanEntity):
                     preset_mode, list(_LABEL_TO_AP_SUB_MODE),
                 )
                 return
-            await self.coordinator.set_ap_sub_mode(value)
-            # Investigation of the Blueair cloud API responses and AWS
-            # IoT protocol behavior shows that apsubmode writes on
-            # Signature-family devices are paired with a fanspeed
-            # reset (see _SIGNATURE_APSUBMODE_FANSPEED_RESET docstring).
-            # The slider is hidden in non-manual presets, so this write
-            # is invisible while the preset is active.
-            await self.coordinator.set_fan_speed(_SIGNATURE_APSUBMODE_FANSPEED_RESET)
+            async with self.coordinator.batch():
+                await self.coordinator.set_ap_sub_mode(value)
+                # Investigation of the Blueair cloud API responses and AWS
+                # IoT protocol behavior shows that apsubmode writes on
+                # Signature-family devices are paired with a fanspeed
+                # reset (see _SIGNATURE_APSUBMODE_FANSPEED_RESET docstring).
+                # The slider is hidden in non-manual presets, so this write
+                # is invisible while the preset is active.
+                await self.coordinator.set_fan_speed(_SIGNATURE_APSUBMODE_FANSPEED_RESET)
             self.async_write_ha_state()
             return
 
@@ -45,8 +45,8 @@ class BlueairAwsHumidifier(BlueairEntity, HumidifierEntity):
         # dedicated ``humidifier_mode``) are handled by BlueairAwsComboHumidifier so
         # that turning humidification off does not power down the purifier.
         return (
-            coordinator.auto_regulated_humidity is not NotImplemented
-            and coordinator.humidifier_mode is NotImplemented
+            coordinator.implements("auto_regulated_humidity")
+            and not coordinator.implements("humidifier_mode")
         )
 
     def __init__(self, coordinator: BlueairUpdateCoordinator):
@@ -99,20 +99,23 @@ class BlueairAwsHumidifier(BlueairEntity, HumidifierEntity):
     async def async_set_mode(self, mode):
         if mode == MODE_AUTO:
             # This mode doesn't apply when off
-            await self.coordinator.set_fan_auto_mode(True)
-            await self.coordinator.set_running(True)
+            async with self.coordinator.batch():
+                await self.coordinator.set_fan_auto_mode(True)
+                await self.coordinator.set_running(True)
             self.async_write_ha_state()
         elif mode == MODE_SLEEP:
             # This mode doesn't apply when off
-            await self.coordinator.set_night_mode(True)
-            await self.coordinator.set_fan_auto_mode(False)
-            await self.coordinator.set_running(False)
+            async with self.coordinator.batch():
+                await self.coordinator.set_night_mode(True)
+                await self.coordinator.set_fan_auto_mode(False)
+                await self.coordinator.set_running(False)
             self.async_write_ha_state()
         elif mode == MODE_FAN_SPEED:
             # This mode doesn't apply when off
-            await self.coordinator.set_fan_auto_mode(False)
-            await self.coordinator.set_night_mode(False)
-            await self.coordinator.set_running(True)
+            async with self.coordinator.batch():
+                await self.coordinator.set_fan_auto_mode(False)
+                await self.coordinator.set_night_mode(False)
+                await self.coordinator.set_running(True)
 
             self.async_write_ha_state()
         else:
@@ -120,9 +123,11 @@ class BlueairAwsHumidifier(BlueairEntity, HumidifierEntity):
 
     async def async_set_humidity(self, humidity):
         """Set the humidity level. Sets Humidifier to 'On' to comply with hass requirements, and sets mode to Auto since this is the only mode in which the target humidity is used."""
-        await self.coordinator.set_auto_regulated_humidity(humidity)
-        await self.coordinator.set_fan_auto_mode(True)
-        await self.async_turn_on()
+        async with self.coordinator.batch():
+            await self.coordinator.set_auto_regulated_humidity(humidity)
+            await self.coordinator.set_fan_auto_mode(True)
+            await self.coordinator.set_running(True)
+        self.async_write_ha_state()
 
 
 class BlueairAwsComboHumidifier(BlueairEntity, HumidifierEntity):
@@ -137,7 +142,7 @@ class BlueairAwsComboHumidifier(BlueairEntity, HumidifierEntity):
 
     @classmethod
     def is_implemented(kls, coordinator):
-        return coordinator.humidifier_mode is not NotImplemented
+        return coordinator.implements("humidifier_mode")
 
     def __init__(self, coordinator: BlueairUpdateCoordinator):
         """Initialize the combo humidifier."""
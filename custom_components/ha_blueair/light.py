@@ -1,4 +1,6 @@
 from __future__ import annotations
+from typing import Any
+
 from homeassistant.components.light import (
     ATTR_BRIGHTNESS,
     LightEntity,
@@ -31,9 +33,12 @@ class BlueairRestoredBrightnessEntity(BlueairEntity, LightEntity, RestoreEntity)
     """Base light entity that retains brightness while the light is off."""
 
     @property
-    def extra_state_attributes(self) -> dict[str, int]:
+    def extra_state_attributes(self) -> dict[str, Any]:
         """Return the brightness used when the light is next turned on."""
-        return {_ATTR_LAST_BRIGHTNESS: self._last_brightness}
+        return {
+            **(super().extra_state_attributes or {}),
+            _ATTR_LAST_BRIGHTNESS: self._last_brightness,
+        }
 
     async def async_added_to_hass(self) -> None:
         """Restore the previous brightness after a Home Assistant restart."""
@@ -58,12 +63,15 @@ class BlueairLightEntity(BlueairRestoredBrightnessEntity):
 
     @classmethod
     def is_implemented(kls, coordinator):
-        return coordinator.brightness is not NotImplemented
+        return coordinator.implements("brightness")
 
     def __init__(self, coordinator):
         super().__init__("LED Light", coordinator)
         self._last_brightness = self.coordinator.brightness or 255
 
+    def coordinator_properties(self) -> tuple[str, ...]:
+        return ("brightness",)
+
     @property
     def brightness(self) -> int | None:
         """Return the brightness of this light between 0..255."""
@@ -95,12 +103,15 @@ class BlueairMoodLightEntity(BlueairRestoredBrightnessEntity):
 
     @classmethod
     def is_implemented(kls, coordinator):
-        return coordinator.mood_brightness is not NotImplemented
+        return coordinator.implements("mood_brightness")
 
     def __init__(self, coordinator):
         super().__init__("Mood Light", coordinator)
         self._last_brightness = self.coordinator.mood_brightness or 255
 
+    def coordinator_properties(self) -> tuple[str, ...]:
+        return ("mood_brightness",)
+
     @property
     def brightness(self) -> int | None:
         """Return the brightness of this light between 0..255."""
@@ -132,12 +143,15 @@ class BlueairNightLightEntity(BlueairRestoredBrightnessEntity):
 
     @classmethod
     def is_implemented(kls, coordinator):
-        return coordinator.night_light_brightness is not NotImplemented
+        return coordinator.implements("night_light_brightness")
 
     def __init__(self, coordinator):
         super().__init__("Night Light", coordinator)
         self._last_brightness = self.coordinator.night_light_brightness or 255
 
+    def coordinator_properties(self) -> tuple[str, ...]:
+        return ("night_light_brightness",)
+
     @property
     def brightness(self) -> int | None:
         """Return the brightness of this light between 0..255."""
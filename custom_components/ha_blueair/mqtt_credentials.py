@@ -0,0 +1,165 @@
+"""Refreshes the MQTT credentials of an account before they expire.
+
+Without this, the broker drops the connections of an account once its
+token expires, and every shard logs in again while reconnecting; pushed
+updates are lost until it is back.  The credentials are refreshed ahead
+of expiry instead, after which each shard moves to a new connection made
+with them.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Any
+
+from aiohttp import ClientError
+from blueair_api import HttpAwsBlueair, LoginError
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    MQTT_CREDENTIAL_REFRESH_MARGIN_SECONDS,
+    MQTT_CREDENTIAL_RETRY_SECONDS,
+)
+from .mqtt_shard import MqttShard
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def token_expiry(token: str | None) -> datetime | None:
+    """Return when a JWT expires, or None if it isn't one or has no expiry."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return dt_util.utc_from_timestamp(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class MqttCredentials:
+    """The MQTT credentials of an account and their refresh schedule."""
+
+    def __init__(self, hass: HomeAssistant, aws_http_client: HttpAwsBlueair) -> None:
+        """Initialize the credentials."""
+        self.hass = hass
+        self._aws_http_client = aws_http_client
+        self.shards: list[MqttShard] = []
+        self.expires_at: datetime | None = None
+        self.refreshes = 0
+        self.last_refresh: datetime | None = None
+        self._unsub_refresh: CALLBACK_TYPE | None = None
+        self._refresh_task: asyncio.Task | None = None
+        self._update_expiry()
+
+    def _update_expiry(self) -> None:
+        self.expires_at = token_expiry(self._aws_http_client.mqtt_auth_token) or token_expiry(
+            self._aws_http_client.access_token
+        )
+
+    @property
+    def fresh(self) -> bool:
+        """Return True while the credentials are valid beyond the refresh margin."""
+        return self.expires_at is not None and self.expires_at - dt_util.utcnow() > timedelta(
+            seconds=MQTT_CREDENTIAL_REFRESH_MARGIN_SECONDS
+        )
+
+    def _current(self) -> tuple[str, str, str]:
+        return (
+            self._aws_http_client.mqtt_auth_name,
+            self._aws_http_client.mqtt_auth_signature,
+            self._aws_http_client.mqtt_auth_token,
+        )
+
+    async def async_get(self) -> tuple[str, str, str]:
+        """Return credentials for a (re)connect, logging in again unless fresh.
+
+        Used as the credential refresher of the MQTT clients, which call it
+        before every connection attempt.
+        """
+        if not self.fresh:
+            await self.async_refresh()
+        return self._current()
+
+    async def async_refresh(self) -> None:
+        """Log in again for new credentials and schedule their refresh."""
+        await self._aws_http_client.refresh_access_token()
+        self.refreshes += 1
+        self.last_refresh = dt_util.utcnow()
+        self._update_expiry()
+        _LOGGER.debug("MQTT credentials refreshed, valid until %s", self.expires_at)
+        self.async_schedule()
+
+    @callback
+    def async_schedule(self) -> None:
+        """Schedule the next refresh ahead of the expiry of the credentials."""
+        self._async_cancel_timer()
+        if self.expires_at is None:
+            _LOGGER.debug("MQTT credentials have no known expiry, refreshing on reconnect only")
+            return
+        now = dt_util.utcnow()
+        remaining = self.expires_at - now
+        # Short-lived credentials are refreshed halfway through their life,
+        # but never sooner than a retry would be.
+        lead = min(timedelta(seconds=MQTT_CREDENTIAL_REFRESH_MARGIN_SECONDS), remaining / 2)
+        refresh_at = max(
+            self.expires_at - lead, now + timedelta(seconds=MQTT_CREDENTIAL_RETRY_SECONDS)
+        )
+        self._unsub_refresh = async_track_point_in_utc_time(
+            self.hass, self._async_refresh_due, refresh_at
+        )
+
+    @callback
+    def _async_refresh_due(self, _now: datetime) -> None:
+        self._unsub_refresh = None
+        self._refresh_task = self.hass.async_create_background_task(
+            self._async_refresh_and_hand_over(), f"{DOMAIN} mqtt credential refresh"
+        )
+
+    async def _async_refresh_and_hand_over(self) -> None:
+        try:
+            await self.async_refresh()
+        except (LoginError, ClientError, TimeoutError) as ex:
+            _LOGGER.warning(
+                "Refreshing MQTT credentials failed, retrying in %d s: %s",
+                MQTT_CREDENTIAL_RETRY_SECONDS,
+                ex,
+            )
+            self._async_cancel_timer()
+            self._unsub_refresh = async_track_point_in_utc_time(
+                self.hass,
+                self._async_refresh_due,
+                dt_util.utcnow() + timedelta(seconds=MQTT_CREDENTIAL_RETRY_SECONDS),
+            )
+            return
+        await asyncio.gather(
+            *(shard.async_hand_over() for shard in self.shards if shard.client is not None)
+        )
+
+    @callback
+    def _async_cancel_timer(self) -> None:
+        if self._unsub_refresh is not None:
+            self._unsub_refresh()
+            self._unsub_refresh = None
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop refreshing the credentials."""
+        self._async_cancel_timer()
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the state of the credentials."""
+        return {
+            "expires_at": self.expires_at,
+            "refreshes": self.refreshes,
+            "last_refresh": self.last_refresh,
+            "refresh_scheduled": self._unsub_refresh is not None,
+        }
@@ -0,0 +1,280 @@
+"""Spreads the AWS devices of an account over several MQTT connections.
+
+Each connection runs its own network thread, so a slow or reconnecting
+connection only delays the devices subscribed on it.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from time import monotonic
+from typing import Any
+
+from blueair_api import HttpAwsBlueair, MqttAwsBlueair
+
+from homeassistant.core import HomeAssistant, callback
+
+from .blueair_update_coordinator_device_aws import BlueairUpdateCoordinatorDeviceAws
+from .const import (
+    MQTT_HANDOVER_TIMEOUT_SECONDS,
+    PUSH_STATUS_CONNECTED,
+    PUSH_STATUS_DISCONNECTED,
+    PUSH_STATUS_POLLING,
+)
+from .mqtt_mapping import map_and_publish_event
+from .mqtt_update_buffer import MqttUpdateBuffer
+
+_LOGGER = logging.getLogger(__name__)
+
+type CredentialRefresher = Callable[[], Awaitable[tuple[str, str, str]]]
+
+
+class MqttShard:
+    """One MQTT connection and the devices subscribed on it."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        index: int,
+        count: int,
+        coordinators: list[BlueairUpdateCoordinatorDeviceAws],
+        region: str,
+        aws_http_client: HttpAwsBlueair,
+        update_buffer: MqttUpdateBuffer,
+        credential_refresher: CredentialRefresher,
+    ) -> None:
+        """Initialize the shard."""
+        self.hass = hass
+        self.index = index
+        self.count = count
+        self.coordinators = coordinators
+        self.client: MqttAwsBlueair | None = None
+        self._region = region
+        self._aws_http_client = aws_http_client
+        self._update_buffer = update_buffer
+        self._credential_refresher = credential_refresher
+        self._coordinator_map = {c.id: c for c in coordinators}
+        # Reconnect gaps, measured from a drop of the connection to the
+        # moment it is back, and connections replaced with new credentials.
+        self._disconnected_at: float | None = None
+        self.reconnects = 0
+        self.last_reconnect_gap: float | None = None
+        self.max_reconnect_gap: float | None = None
+        self.handovers = 0
+
+    @property
+    def name(self) -> str:
+        """Return the shard's position, such as 2/4."""
+        return f"{self.index + 1}/{self.count}"
+
+    @property
+    def connected(self) -> bool:
+        """Return True while the shard's connection is up."""
+        return self.client is not None and self.client.connected
+
+    @callback
+    def async_set_push_status(self, status: str) -> None:
+        """Record the push status of every device on the shard."""
+        for coordinator in self.coordinators:
+            coordinator.async_set_push_status(status)
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the health of the shard."""
+        return {
+            "shard": self.name,
+            "started": self.client is not None,
+            "connected": self.connected,
+            "devices": [coordinator.id for coordinator in self.coordinators],
+            "reconnects": self.reconnects,
+            "last_reconnect_gap": self.last_reconnect_gap,
+            "max_reconnect_gap": self.max_reconnect_gap,
+            "handovers": self.handovers,
+        }
+
+    async def async_start(self) -> None:
+        """Connect the shard; its devices keep being polled if that fails."""
+        mqtt_client = None
+        try:
+            mqtt_client = self._build_client()
+            # Unload disconnects the client, so it is handed to the shard
+            # before connecting.
+            self.client = mqtt_client
+            await self._async_connect(mqtt_client)
+            _LOGGER.info(
+                "MQTT real-time updates started for %d device(s) on shard %s",
+                len(self.coordinators),
+                self.name,
+            )
+        except Exception:
+            _LOGGER.exception(
+                "Failed to start MQTT shard %s, falling back to polling only", self.name
+            )
+            self.client = None
+            if mqtt_client is not None:
+                mqtt_client.disconnect()
+            self.async_set_push_status(PUSH_STATUS_POLLING)
+
+    async def async_hand_over(self) -> None:
+        """Move the shard to a new connection made with the current credentials.
+
+        The old connection keeps delivering updates until the new one is
+        subscribed, so none are lost in between.
+        """
+        connected = asyncio.Event()
+        mqtt_client = self._build_client(connected)
+        try:
+            await self._async_connect(mqtt_client)
+            async with asyncio.timeout(MQTT_HANDOVER_TIMEOUT_SECONDS):
+                await connected.wait()
+        except Exception:
+            _LOGGER.warning(
+                "MQTT shard %s could not open a new connection, keeping the current one",
+                self.name,
+                exc_info=True,
+            )
+            await self.hass.async_add_executor_job(mqtt_client.disconnect)
+            return
+        old_client, self.client = self.client, mqtt_client
+        self.handovers += 1
+        self._record_connected()
+        self.async_set_push_status(PUSH_STATUS_CONNECTED)
+        _LOGGER.debug("MQTT shard %s moved to a new connection", self.name)
+        if old_client is not None:
+            await self.hass.async_add_executor_job(old_client.disconnect)
+
+    async def _async_connect(self, mqtt_client: MqttAwsBlueair) -> None:
+        # Run connect in executor to avoid blocking the event loop
+        # (TLS handshake is a blocking operation).
+        connect = self.hass.async_add_executor_job(mqtt_client.connect, self.hass.loop)
+        try:
+            await asyncio.shield(connect)
+        except asyncio.CancelledError:
+            # Unloaded while connecting; a connect can't be interrupted, so
+            # the connection is closed once it is made.
+            connect.add_done_callback(
+                lambda _: self.hass.async_add_executor_job(mqtt_client.disconnect)
+            )
+            raise
+
+    def _record_connected(self) -> None:
+        if self._disconnected_at is None:
+            return
+        gap = monotonic() - self._disconnected_at
+        self._disconnected_at = None
+        self.reconnects += 1
+        self.last_reconnect_gap = gap
+        self.max_reconnect_gap = max(gap, self.max_reconnect_gap or 0)
+        _LOGGER.info("MQTT shard %s was disconnected for %.1f s", self.name, gap)
+
+    def _build_client(self, connected: asyncio.Event | None = None) -> MqttAwsBlueair:
+        """Create a client for the shard's devices with the current credentials."""
+        hass = self.hass
+        aws_http_client = self._aws_http_client
+        update_buffer = self._update_buffer
+        aws_coordinator_map = self._coordinator_map
+        mqtt_client = MqttAwsBlueair(
+            region=self._region,
+            mqtt_auth_name=aws_http_client.mqtt_auth_name,
+            mqtt_auth_signature=aws_http_client.mqtt_auth_signature,
+            mqtt_auth_token=aws_http_client.mqtt_auth_token,
+            user_id=aws_http_client.user_id,
+        )
+
+        def on_sensor_data(device_id, sensors):
+            """Handle MQTT sensor data (called from MQTT thread)."""
+            _LOGGER.debug(f"processing sensor update {sensors} for {device_id}")
+            coordinator = aws_coordinator_map.get(device_id)
+            if coordinator is None:
+                _LOGGER.debug(f"sensor data update provided for unknown device: {device_id}")
+                return
+            coordinator.record_push()
+            device = coordinator.blueair_api_device
+            try:
+                device.apply_sensor_data(sensors)
+            except Exception:
+                _LOGGER.exception(
+                    "apply_sensor_data raised for device %s with payload %r",
+                    device_id, sensors,
+                )
+                return
+            device.publish_updates()
+            update_buffer.add(coordinator)
+
+        def on_state_change(device_id, state):
+            """Handle MQTT shadow state change (called from MQTT thread)."""
+            _LOGGER.debug(f"processing state change {state} for {device_id}")
+            coordinator = aws_coordinator_map.get(device_id)
+            if coordinator is None:
+                _LOGGER.debug(f"state change provided for unknown device: {device_id}")
+                return
+            coordinator.record_push()
+            device = coordinator.blueair_api_device
+            try:
+                device.apply_state_change(state)
+            except Exception:
+                _LOGGER.exception(
+                    "apply_state_change raised for device %s with payload %r",
+                    device_id, state,
+                )
+                return
+            device.publish_updates()
+            update_buffer.add(coordinator, state)
+
+        def on_event(device_id, event):
+            """Handle MQTT connectivity event (called from MQTT thread)."""
+            _LOGGER.debug(f"processing event update {event} for {device_id}")
+            coordinator = aws_coordinator_map.get(device_id)
+            if coordinator is None:
+                _LOGGER.debug(f"event data update provided for unknown device: {device_id}")
+                return
+            device = coordinator.blueair_api_device
+            map_and_publish_event(event, device)
+            update_buffer.add(coordinator)
+
+        def on_connect():
+            """Report the shard as connected (called from MQTT thread)."""
+            if connected is not None:
+                hass.loop.call_soon_threadsafe(connected.set)
+            # A new connection is still waiting to take over.
+            if mqtt_client is not self.client:
+                return
+            _LOGGER.debug("MQTT shard %s connected", self.name)
+            self._record_connected()
+            hass.loop.call_soon_threadsafe(self.async_set_push_status, PUSH_STATUS_CONNECTED)
+
+        def on_disconnect():
+            """Resume REST polling while MQTT is down (called from MQTT thread)."""
+            # A replaced connection closing.
+            if mqtt_client is not self.client:
+                return
+            _LOGGER.debug("MQTT shard %s disconnected", self.name)
+            self._disconnected_at = monotonic()
+            for coordinator in self.coordinators:
+                coordinator.clear_push()
+            hass.loop.call_soon_threadsafe(self.async_set_push_status, PUSH_STATUS_DISCONNECTED)
+
+        mqtt_client.on_sensor_data = on_sensor_data
+        mqtt_client.on_state_change = on_state_change
+        mqtt_client.on_event = on_event
+        mqtt_client.on_connect_callback = on_connect
+        mqtt_client.on_disconnect_callback = on_disconnect
+        # Credential refresher for automatic reconnect on token expiry.
+        mqtt_client.credential_refresher = self._credential_refresher
+
+        for coordinator in self.coordinators:
+            mqtt_client.register_device(coordinator.id)
+        return mqtt_client
+
+
+def split_devices(
+    coordinators: list[BlueairUpdateCoordinatorDeviceAws], count: int
+) -> list[list[BlueairUpdateCoordinatorDeviceAws]]:
+    """Deal the devices over at most ``count`` shards of near equal size.
+
+    Devices are dealt in uuid order, so they keep their shard across
+    restarts as long as the device list doesn't change.
+    """
+    count = max(1, min(count, len(coordinators)))
+    ordered = sorted(coordinators, key=lambda coordinator: coordinator.id)
+    return [ordered[index::count] for index in range(count)]
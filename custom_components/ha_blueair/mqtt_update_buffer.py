@@ -0,0 +1,59 @@
+"""Coalesces MQTT updates before they reach the event loop.
+
+The MQTT client calls back on its own thread for every message, and a
+sensor burst can carry many messages per device.  The buffer collects
+the devices that changed, plus the shadow fields they reported, and
+hands them to the loop once per short window, so a burst costs one
+wakeup and one coordinator update per device.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .blueair_update_coordinator_device_aws import BlueairUpdateCoordinatorDeviceAws
+
+
+class MqttUpdateBuffer:
+    """Per-device MQTT updates waiting to be flushed to the loop."""
+
+    def __init__(self, hass: HomeAssistant, window: float) -> None:
+        """Initialize the buffer."""
+        self._hass = hass
+        self._window = window
+        self._lock = threading.Lock()
+        # Pending devices with the shadow fields reported since the last flush.
+        self._pending: dict[BlueairUpdateCoordinatorDeviceAws, dict[str, Any]] = {}
+        self._flush_scheduled = False
+
+    def add(
+        self,
+        coordinator: BlueairUpdateCoordinatorDeviceAws,
+        state: dict[str, Any] | None = None,
+    ) -> None:
+        """Mark a device as updated; safe to call from the MQTT thread."""
+        with self._lock:
+            reported = self._pending.setdefault(coordinator, {})
+            if state:
+                reported.update(state)
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        self._hass.loop.call_soon_threadsafe(self._async_schedule_flush)
+
+    @callback
+    def _async_schedule_flush(self) -> None:
+        self._hass.loop.call_later(self._window, self._async_flush)
+
+    @callback
+    def _async_flush(self) -> None:
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            self._flush_scheduled = False
+        for coordinator, reported in pending.items():
+            coordinator.async_publish_device_state()
+            if reported:
+                coordinator.async_state_reported(reported)
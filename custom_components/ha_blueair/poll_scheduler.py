@@ -0,0 +1,98 @@
+"""Spreads coordinator refreshes evenly across the scan interval.
+
+Every coordinator of a config entry is created in the same loop with the
+same interval, so left alone their refreshes fire in a burst.  The
+scheduler gives each coordinator its own phase within the interval and
+the coordinators keep refreshing on that phase, plus a little random
+jitter, for as long as they run.
+
+After a failed refresh the coordinator retries sooner, backing off
+exponentially up to the interval, and returns to its phase once a
+refresh succeeds again.  A coordinator can retry on more than a failed
+refresh by overriding ``refresh_failing``.
+"""
+from __future__ import annotations
+
+import random
+from collections.abc import Sequence
+from datetime import timedelta
+
+from homeassistant.core import callback
+
+from .const import REFRESH_RETRY_SECONDS
+
+
+class PhasedRefreshMixin:
+    """DataUpdateCoordinator mixin that refreshes on a fixed phase."""
+
+    refresh_phase: float | None = None
+    refresh_jitter: float = 0
+    refresh_retries: int = 0
+    # Set while the refresh started by a retry timer runs.
+    refresh_retry: bool = False
+
+    @property
+    def refresh_failing(self) -> bool:
+        """Return True while refreshes should be retried off the phase."""
+        return not self.last_update_success
+
+    @callback
+    def set_refresh_phase(self, interval: timedelta, phase: float, jitter: float) -> None:
+        """Move the refresh schedule onto the given phase of the interval."""
+        self.update_interval = interval
+        self.refresh_phase = phase
+        self.refresh_jitter = jitter
+        if self._unsub_refresh is not None:
+            self._schedule_refresh()
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        if self.refresh_phase is None or self.update_interval is None:
+            super()._schedule_refresh()
+            return
+        if self.config_entry and self.config_entry.pref_disable_polling:
+            return
+        self._async_unsub_refresh()
+        interval = self.update_interval.total_seconds()
+        loop = self.hass.loop
+        now = loop.time()
+        if not self.refresh_failing:
+            self.refresh_retries = 0
+            # Next point after now that sits on this coordinator's phase.
+            target = now - (now - self.refresh_phase) % interval + interval
+        else:
+            target = now + min(REFRESH_RETRY_SECONDS * 2**self.refresh_retries, interval)
+            self.refresh_retries += 1
+        target += random.uniform(0, min(self.refresh_jitter, interval / 2))
+        self._unsub_refresh = loop.call_at(target, self._async_phased_refresh_due).cancel
+
+    @callback
+    def _async_phased_refresh_due(self) -> None:
+        self.refresh_retry = self.refresh_retries > 0
+        name = f"{self.name} - refresh"
+        if self.config_entry:
+            self.config_entry.async_create_background_task(
+                self.hass, self._handle_refresh_interval(), name, eager_start=True
+            )
+        else:
+            self.hass.async_create_background_task(
+                self._handle_refresh_interval(), name, eager_start=True
+            )
+
+
+@callback
+def stagger_refreshes(
+    coordinators: Sequence[PhasedRefreshMixin], interval: timedelta, jitter: float
+) -> None:
+    """Assign evenly spaced refresh phases to coordinators.
+
+    The phases start from a random offset so that several config entries
+    do not line up with each other.
+    """
+    if not coordinators:
+        return
+    seconds = interval.total_seconds()
+    offset = random.uniform(0, seconds)
+    step = seconds / len(coordinators)
+    for index, coordinator in enumerate(coordinators):
+        coordinator.set_refresh_phase(interval, (offset + index * step) % seconds, jitter)
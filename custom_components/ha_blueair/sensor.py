@@ -58,13 +58,17 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     # dashboards, low-battery automations and HomeKit battery reporting.  That
     # classification has been removed (#378).  Surface a dismissible repair to
     # let affected users know and point them at the migration guide.  Only fire
-    # when the account actually exposes one of these sensors, and self-heal if
-    # it no longer does.
-    coordinators = (
-        hass.data[DOMAIN][DATA_DEVICES] + hass.data[DOMAIN][DATA_AWS_DEVICES]
-    )
+    # when an account actually exposes one of these sensors, and self-heal if
+    # none does.  The issue is shared by all accounts, so every set up entry
+    # is checked.
+    coordinators = [
+        coordinator
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if (data := getattr(entry, "runtime_data", None)) is not None
+        for coordinator in data[DATA_DEVICES] + data[DATA_AWS_DEVICES]
+    ]
     has_life_level_sensor = any(
-        getattr(coordinator, key, NotImplemented) is not NotImplemented
+        coordinator.implements(key)
         for coordinator in coordinators
         for key in _LIFE_LEVEL_SENSOR_KEYS
     )
@@ -87,17 +91,19 @@ class BlueairSensor(BlueairEntity, SensorEntity):
 
     @classmethod
     def is_implemented(kls, coordinator):
-        # Use NotImplemented as the default so a coordinator that doesn't even
-        # declare this attribute (e.g. an AWS-only property on the legacy
-        # coordinator class) is treated as "not implemented" instead of
-        # raising AttributeError, which would abort the whole sensor platform.
-        # See issue #356.
-        return getattr(coordinator, kls(coordinator).entity_description.key, NotImplemented) is not NotImplemented
+        # A coordinator that doesn't even declare this attribute (e.g. an
+        # AWS-only property on the legacy coordinator class) counts as "not
+        # implemented" instead of raising AttributeError, which would abort
+        # the whole sensor platform.  See issue #356.
+        return coordinator.implements(kls.entity_description.key)
 
     def __init__(self, coordinator: BlueairUpdateCoordinator):
         """Initialize the temperature sensor."""
         super().__init__(self.entity_description.name, coordinator)
 
+    def coordinator_properties(self) -> tuple[str, ...]:
+        return (self.entity_description.key,)
+
     @property
     def native_value(self) -> float | None:
         """Return the current temperature."""
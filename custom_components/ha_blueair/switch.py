@@ -24,11 +24,14 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
 class BlueairSwitchEntity(BlueairEntity, SwitchEntity):
     @classmethod
     def is_implemented(kls, coordinator):
-        return getattr(coordinator, kls(coordinator).entity_description.key) is not NotImplemented
+        return coordinator.implements(kls.entity_description.key)
 
     def __init__(self, coordinator):
         super().__init__(self.entity_description.name, coordinator)
 
+    def coordinator_properties(self) -> tuple[str, ...]:
+        return (self.entity_description.key,)
+
     @property
     def is_on(self) -> bool | None:
         return getattr(self.coordinator, self.entity_description.key)
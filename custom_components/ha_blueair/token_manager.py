@@ -0,0 +1,127 @@
+"""Single-flight access token refresh for an AWS account.
+
+Device polls, commands and the MQTT credential refresher share one
+``HttpAwsBlueair`` per account, and each of them logs in again when its
+request hits an expired token.  The token manager takes over the client's
+``refresh_access_token`` so concurrent callers wait on one login, and
+callers that only notice the expiry once it is done get its tokens
+instead of logging in once more.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+from time import monotonic
+from typing import Any
+
+from blueair_api import HttpAwsBlueair
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, TOKEN_REFRESH_REUSE_SECONDS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Set by a login, and cleared by the client when a request fails on an
+# expired session.
+TOKEN_ATTRIBUTES = (
+    "session_token",
+    "session_secret",
+    "jwt",
+    "access_token",
+    "user_id",
+    "mqtt_auth_name",
+    "mqtt_auth_signature",
+    "mqtt_auth_token",
+)
+
+
+class TokenManager:
+    """Deduplicates the access token refreshes of an account."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        aws_http_client: HttpAwsBlueair,
+        on_login: Callable[[], None] | None = None,
+    ) -> None:
+        """Initialize the manager and install it on the client.
+
+        ``on_login`` is called after every successful login.
+        """
+        self.hass = hass
+        self._aws_http_client = aws_http_client
+        self._on_login = on_login
+        self._login = aws_http_client.refresh_access_token
+        self._refresh_task: asyncio.Task | None = None
+        self._tokens: tuple[Any, ...] | None = None
+        self._refreshed_at: float | None = None
+        self.refreshes = 0
+        self.failures = 0
+        self.joined = 0
+        self.reused = 0
+        self.last_latency: float | None = None
+        self.max_latency: float | None = None
+        self._total_latency = 0.0
+        aws_http_client.refresh_access_token = self.async_refresh
+
+    async def async_refresh(self) -> None:
+        """Log in again, or wait for the login already in flight."""
+        if self._refresh_task is None:
+            if (
+                self._refreshed_at is not None
+                and monotonic() - self._refreshed_at < TOKEN_REFRESH_REUSE_SECONDS
+            ):
+                # A request sent before the last login completed failed on
+                # the old token; the new one is still good.
+                self.reused += 1
+                self._restore_tokens()
+                return
+            # Not started eagerly, so a login failing at once can't clear
+            # the task before it is stored.
+            self._refresh_task = self.hass.async_create_background_task(
+                self._async_login(), f"{DOMAIN} token refresh", eager_start=False
+            )
+        else:
+            self.joined += 1
+        # One caller being cancelled mustn't cancel the login of the others.
+        await asyncio.shield(self._refresh_task)
+
+    async def _async_login(self) -> None:
+        started = monotonic()
+        try:
+            await self._login()
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            self._refresh_task = None
+        self._refreshed_at = monotonic()
+        latency = self._refreshed_at - started
+        self.refreshes += 1
+        self.last_latency = latency
+        self.max_latency = max(latency, self.max_latency or 0)
+        self._total_latency += latency
+        self._tokens = tuple(
+            getattr(self._aws_http_client, name) for name in TOKEN_ATTRIBUTES
+        )
+        _LOGGER.debug("access token refreshed in %.2f s", latency)
+        if self._on_login is not None:
+            self._on_login()
+
+    def _restore_tokens(self) -> None:
+        for name, value in zip(TOKEN_ATTRIBUTES, self._tokens):
+            setattr(self._aws_http_client, name, value)
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the refresh counts and latencies."""
+        return {
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "joined": self.joined,
+            "reused": self.reused,
+            "last_latency": self.last_latency,
+            "max_latency": self.max_latency,
+            "mean_latency": self._total_latency / self.refreshes if self.refreshes else None,
+        }
@@ -0,0 +1,137 @@
+"""Persists the login of a config entry so a restart does not log in again.
+
+The AWS client's session, access token and MQTT credentials are stored
+after every login and put back into a new client on the next start.  A
+client with an expired or rejected token logs in again by itself.  For
+the legacy cloud only the home host is kept: its client cannot tell a
+rejected token apart from a valid response, so it always logs in.
+
+Most accounts have no legacy devices, and their legacy login fails or
+times out.  The store remembers when the legacy cloud last listed no
+devices, or refused repeated logins, so setup can skip it and re-check it
+in the background instead.
+"""
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+from blueair_api import HttpAwsBlueair, HttpBlueair
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, LEGACY_LOGIN_FAILURES, LEGACY_RECHECK_HOURS, TOKEN_SAVE_DELAY
+from .mqtt_credentials import token_expiry
+from .token_manager import TOKEN_ATTRIBUTES
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+
+class TokenStore:
+    """Stored login of one config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.tokens", private=True
+        )
+        self._http_client: HttpBlueair | None = None
+        self._aws_http_client: HttpAwsBlueair | None = None
+        self.no_legacy_devices_since: datetime | None = None
+        self.legacy_login_failures = 0
+        # Called when the account is first marked as having no legacy devices.
+        self.on_no_legacy_devices: Callable[[], None] | None = None
+
+    async def async_load(self, http_client: HttpBlueair, aws_http_client: HttpAwsBlueair) -> bool:
+        """Put the stored login into the clients, which are saved from now on.
+
+        Returns True if the AWS client got a login that hasn't expired.
+        """
+        self._http_client = http_client
+        self._aws_http_client = aws_http_client
+        stored = await self._store.async_load()
+        if stored is None:
+            return False
+        # A login of another account, after the entry was reconfigured.
+        if stored.get("username") != self._aws_http_client.username:
+            return False
+        if stored.get("home_host"):
+            self._http_client.home_host = stored["home_host"]
+        if stored.get("no_legacy_devices_since"):
+            self.no_legacy_devices_since = dt_util.parse_datetime(
+                stored["no_legacy_devices_since"]
+            )
+        self.legacy_login_failures = stored.get("legacy_login_failures", 0)
+        aws_tokens = stored.get("aws", {})
+        expires_at = token_expiry(aws_tokens.get("access_token"))
+        if expires_at is None or expires_at <= dt_util.utcnow():
+            _LOGGER.debug("stored access token expired, logging in again")
+            return False
+        for name in TOKEN_ATTRIBUTES:
+            setattr(self._aws_http_client, name, aws_tokens.get(name))
+        _LOGGER.debug("restored login valid until %s", expires_at)
+        return True
+
+    @property
+    def legacy_recheck_due(self) -> bool:
+        """Return True once the legacy devices should be listed again."""
+        return self.no_legacy_devices_since is None or (
+            dt_util.utcnow() - self.no_legacy_devices_since
+            >= timedelta(hours=LEGACY_RECHECK_HOURS)
+        )
+
+    @callback
+    def async_set_legacy_devices_found(self, found: bool) -> None:
+        """Record whether the legacy cloud listed any devices for the account."""
+        self.legacy_login_failures = 0
+        if found:
+            self.no_legacy_devices_since = None
+            self.async_schedule_save()
+        else:
+            self._async_set_no_legacy_devices()
+
+    @callback
+    def async_record_legacy_login_failure(self) -> None:
+        """Record a refused legacy login; the account has no devices after a few."""
+        self.legacy_login_failures += 1
+        if self.legacy_login_failures >= LEGACY_LOGIN_FAILURES:
+            self._async_set_no_legacy_devices()
+        else:
+            self.async_schedule_save()
+
+    @callback
+    def _async_set_no_legacy_devices(self) -> None:
+        marked = self.no_legacy_devices_since is not None
+        self.no_legacy_devices_since = dt_util.utcnow()
+        self.async_schedule_save()
+        if not marked and self.on_no_legacy_devices is not None:
+            self.on_no_legacy_devices()
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Save the current login of the clients after a short delay."""
+        self._store.async_delay_save(self._data_to_save, TOKEN_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "username": self._aws_http_client.username,
+            "home_host": self._http_client.home_host,
+            "no_legacy_devices_since": self.no_legacy_devices_since.isoformat()
+            if self.no_legacy_devices_since is not None
+            else None,
+            "legacy_login_failures": self.legacy_login_failures,
+            "aws": {
+                name: getattr(self._aws_http_client, name) for name in TOKEN_ATTRIBUTES
+            },
+        }
+
+    async def async_remove(self) -> None:
+        """Delete the stored login."""
+        await self._store.async_remove()
@@ -0,0 +1,118 @@
+"""Fixtures for the Blueair tests.
+
+The Blueair clouds are replaced by fake clients that answer every request
+after a fixed delay, so tests can reason about round trips.  Only the
+clients are faked; the blueair_api devices run as they do against the
+real clouds.
+"""
+import asyncio
+import base64
+import json
+import time
+from collections.abc import Iterator
+from unittest.mock import patch
+
+import pytest
+
+ROUND_TRIP_SECONDS = 0.05
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Load the integration from custom_components."""
+    yield
+
+
+def _jwt(expires_at: float) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": expires_at}).encode()).decode()
+    return f"header.{payload.rstrip('=')}.signature"
+
+
+class FakeCloud:
+    """The devices of one account in both clouds, and the requests made."""
+
+    def __init__(self) -> None:
+        self.aws_devices: list[str] = []
+        self.requests = 0
+
+    async def round_trip(self) -> None:
+        self.requests += 1
+        await asyncio.sleep(ROUND_TRIP_SECONDS)
+
+
+class FakeHttpBlueair:
+    """Legacy cloud client of an account without legacy devices."""
+
+    cloud: FakeCloud
+
+    def __init__(self, username, password, home_host=None, auth_token=None, client_session=None):
+        self.username = username
+        self.home_host = home_host
+        self.auth_token = auth_token
+
+    async def get_devices(self) -> list[dict]:
+        # Home host, login and listing.
+        for _ in range(3):
+            await self.cloud.round_trip()
+        return []
+
+
+class FakeHttpAwsBlueair:
+    """AWS cloud client answering with devices that have no controls."""
+
+    cloud: FakeCloud
+
+    def __init__(self, username, password, region="us", client_session=None):
+        self.username = username
+        self.session_token = None
+        self.session_secret = None
+        self.jwt = None
+        self.access_token = None
+        self.user_id = None
+        self.mqtt_auth_name = None
+        self.mqtt_auth_signature = None
+        self.mqtt_auth_token = None
+
+    async def refresh_access_token(self) -> None:
+        await self.cloud.round_trip()
+        self.session_token = "session"
+        self.access_token = _jwt(time.time() + 3600)
+        self.user_id = "user"
+
+    async def get_access_token(self) -> str:
+        if self.access_token is None:
+            await self.refresh_access_token()
+        return self.access_token
+
+    async def devices(self) -> list[dict]:
+        await self.get_access_token()
+        await self.cloud.round_trip()
+        return [
+            {"uuid": uuid, "name": uuid, "mac": None, "type": "fake"}
+            for uuid in self.cloud.aws_devices
+        ]
+
+    async def device_info(self, device_name, device_uuid) -> dict:
+        await self.cloud.round_trip()
+        return {
+            "configuration": {"di": {"name": device_name}, "ds": {}, "dc": {}},
+            "states": [],
+        }
+
+    async def device_sensors(self, device_name, device_uuid) -> None:
+        await self.cloud.round_trip()
+
+
+@pytest.fixture
+def cloud(hass) -> Iterator[FakeCloud]:
+    """Answer the integration's cloud requests with fake clients."""
+    fake_cloud = FakeCloud()
+    FakeHttpBlueair.cloud = fake_cloud
+    FakeHttpAwsBlueair.cloud = fake_cloud
+    with (
+        patch("custom_components.ha_blueair.HttpBlueair", FakeHttpBlueair),
+        patch("custom_components.ha_blueair.HttpAwsBlueair", FakeHttpAwsBlueair),
+        # The timing tests cover setup up to the entities.
+        patch.object(hass.config_entries, "async_forward_entry_setups"),
+    ):
+        yield fake_cloud
@@ -0,0 +1,89 @@
+"""Startup time of a config entry as its device count grows."""
+import math
+import time
+from datetime import timedelta
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.const import CONF_PASSWORD, CONF_REGION, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.ha_blueair.const import (
+    CONFIG_FLOW_VERSION,
+    DOMAIN,
+    REFRESH_CONCURRENCY,
+    SNAPSHOT_SAVE_DELAY,
+)
+
+from .conftest import ROUND_TRIP_SECONDS, FakeCloud
+
+# Two round trips per AWS device refresh: its info and its sensors.
+DEVICE_REFRESH_SECONDS = 2 * ROUND_TRIP_SECONDS
+
+
+async def _async_time_setup(hass: HomeAssistant, entry: MockConfigEntry) -> float:
+    started = time.monotonic()
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    elapsed = time.monotonic() - started
+    await hass.async_block_till_done()
+    return elapsed
+
+
+async def _async_unload(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    # Write out the delayed saves of the snapshot and login.
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=SNAPSHOT_SAVE_DELAY + 1))
+    await hass.async_block_till_done()
+
+
+def _add_entry(hass: HomeAssistant, cloud: FakeCloud, device_count: int) -> MockConfigEntry:
+    username = f"user{device_count}@example.com"
+    cloud.aws_devices = [f"device-{index}" for index in range(device_count)]
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=CONFIG_FLOW_VERSION,
+        unique_id=username,
+        data={CONF_USERNAME: username, CONF_PASSWORD: "password", CONF_REGION: "us"},
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+async def test_fresh_setup_refreshes_devices_concurrently(
+    hass: HomeAssistant, cloud: FakeCloud
+) -> None:
+    """A first start grows with the refresh concurrency, not the device count."""
+    elapsed = {}
+    for device_count in (10, 50):
+        entry = _add_entry(hass, cloud, device_count)
+        elapsed[device_count] = await _async_time_setup(hass, entry)
+        await _async_unload(hass, entry)
+
+        # The legacy and AWS listings overlap, so the logins and the setup
+        # itself add a few round trips at most.
+        concurrent = math.ceil(device_count / REFRESH_CONCURRENCY) * DEVICE_REFRESH_SECONDS
+        assert elapsed[device_count] < concurrent + 10 * ROUND_TRIP_SECONDS
+
+    # Refreshed one after another, 40 more devices would take 40 refreshes longer.
+    assert elapsed[50] - elapsed[10] < 40 * DEVICE_REFRESH_SECONDS / 2
+
+
+async def test_restored_setup_time_is_flat(hass: HomeAssistant, cloud: FakeCloud) -> None:
+    """A restart sets up from the snapshot, in the same time for any device count."""
+    elapsed = {}
+    for device_count in (10, 50):
+        entry = _add_entry(hass, cloud, device_count)
+        await _async_time_setup(hass, entry)
+        await _async_unload(hass, entry)
+
+        # The snapshot and the stored login spare setup every request; the
+        # devices are reconciled with the cloud in the background.
+        elapsed[device_count] = await _async_time_setup(hass, entry)
+        await _async_unload(hass, entry)
+
+    assert elapsed[50] < elapsed[10] + ROUND_TRIP_SECONDS
+    assert elapsed[50] < ROUND_TRIP_SECONDS